@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent note writes and reads on SQLite, with the default engine
+("before") and with the WAL-tuned engine from models.database ("after").
+
+Usage: python benchmarks/db_concurrency.py [--writers 4] [--readers 8] [--seconds 10]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from models.database import Base, User, build_engine
+from models.notes import Note
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Value below which the given fraction of sorted values falls, in milliseconds."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))] * 1000
+
+def run(label: str, engine, writers: int, readers: int, seconds: float):
+    """Hammer one engine with writer and reader threads and print throughput and latency."""
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    with Session() as db:
+        user = User(email="bench@example.com", username="bench", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    
+    results = {"write": [], "read": []}
+    errors = {"write": 0, "read": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+    
+    def write_notes(worker: int):
+        count = 0
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                with Session() as db:
+                    db.add(Note(user_id=user_id, title=f"Note {worker}-{count}", content="x" * 500))
+                    db.commit()
+            except OperationalError:
+                with lock:
+                    errors["write"] += 1
+                continue
+            with lock:
+                results["write"].append(time.monotonic() - started)
+            count += 1
+    
+    def read_notes():
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                with Session() as db:
+                    db.scalars(
+                        select(Note).where(Note.user_id == user_id)
+                        .order_by(Note.is_pinned.desc(), Note.updated_at.desc()).limit(50)
+                    ).all()
+            except OperationalError:
+                with lock:
+                    errors["read"] += 1
+                continue
+            with lock:
+                results["read"].append(time.monotonic() - started)
+    
+    threads = [threading.Thread(target=write_notes, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=read_notes) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    
+    print(f"\n{label}")
+    for kind in ("write", "read"):
+        latencies = sorted(results[kind])
+        print(f"  {kind:5}: {len(latencies) / seconds:8.1f} ops/s  "
+              f"p50 {percentile(latencies, 0.5):7.2f} ms  p95 {percentile(latencies, 0.95):7.2f} ms  "
+              f"errors {errors[kind]}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        before_url = f"sqlite:///{os.path.join(directory, 'before.db')}"
+        after_url = f"sqlite:///{os.path.join(directory, 'after.db')}"
+        run("Before: default engine (rollback journal)", create_engine(before_url), args.writers, args.readers, args.seconds)
+        run("After: build_engine (WAL, tuned pragmas)", build_engine(after_url), args.writers, args.readers, args.seconds)
+
+if __name__ == "__main__":
+    main()
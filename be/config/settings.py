@@ -4,6 +4,14 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./productivity_app.db"
+    sqlite_wal_enabled: bool = True  # WAL journal with synchronous=NORMAL
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kb: int = 64 * 1024  # page cache per connection
+    sqlite_busy_timeout: float = 5.0  # seconds to wait on a locked database
+    db_pool_size: int = 10  # Postgres connections kept open per engine
+    db_max_overflow: int = 20
+    db_pool_recycle: int = 1800  # seconds before a connection is replaced
+    db_pool_timeout: int = 30  # seconds to wait for a free connection
     redis_url: str = "redis://localhost:6379"
     
     # JWT
@@ -21,12 +29,20 @@ class Settings(BaseSettings):
     google_client_id: Optional[str] = None
     google_client_secret: Optional[str] = None
     google_redirect_uri: str = "http://localhost:8000/integrations/google/callback"
+    google_token_refresher_enabled: bool = True
+    google_token_refresh_interval: int = 300  # seconds between background refresh runs
+    google_token_refresh_margin: int = 600  # refresh tokens expiring within this many seconds
     
     # Jira OAuth
     jira_server: Optional[str] = None
     jira_client_id: Optional[str] = None
     jira_client_secret: Optional[str] = None
     jira_redirect_uri: str = "http://localhost:8000/integrations/jira/callback"
+    jira_sync_enabled: bool = True
+    jira_sync_interval: int = 300  # seconds between incremental ticket mirror syncs
+    jira_full_resync_interval: int = 21600  # seconds between full mirror rebuilds
+    jira_webhook_secret: Optional[str] = None  # enables /webhooks/jira when set
+    jira_cache_ttl: int = 600  # raise (e.g. to 3600) once /webhooks/jira is registered in Jira
     
     # Exchange/Email
     exchange_server: Optional[str] = None
@@ -34,10 +50,51 @@ class Settings(BaseSettings):
     # News API
     news_api_key: str = "placeholder_news_api_key"
     
+    # Outbound HTTP client pools (one per upstream host)
+    http2_enabled: bool = True
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0  # seconds an idle connection is kept open
+    http_timeout: float = 15.0
+    http_connect_timeout: float = 5.0
+    
     # Redis Cache
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
+    redis_max_connections: int = 50
+    cache_l1_enabled: bool = True  # in-process LRU in front of Redis
+    cache_l1_max_bytes: int = 32 * 1024 * 1024
+    cache_l1_max_ttl: int = 60  # upper bound on staleness if an invalidation is missed
+    cache_invalidation_channel: str = "cache:invalidate"
+    cache_memory_fallback: bool = True  # cache in process memory while Redis is unreachable
+    cache_memory_max_bytes: int = 64 * 1024 * 1024
+    cache_reconnect_interval: int = 30  # seconds between Redis reconnection attempts
+    cache_warmup_enabled: bool = False  # load recently active users' widgets on startup
+    cache_warmup_blocking: bool = False  # finish the warm-up before accepting traffic
+    cache_warmup_timeout: int = 60  # upper bound on a blocking warm-up
+    cache_warmup_active_hours: int = 24
+    cache_warmup_max_users: int = 100
+    cache_warmup_concurrency: int = 8
+    cache_tag_ttl: int = 86400  # lifetime of the per-user key sets used for invalidation
+    cache_serializer: str = "json"  # "json" (orjson when installed) or "msgpack"
+    cache_compression: str = "zstd"  # "zstd", "zlib" or "none"
+    cache_compression_min_bytes: int = 1024
+    cache_xfetch_beta: float = 1.0  # >1 refreshes earlier, <1 later
+    cache_refresh_lock_ttl: int = 30
+    cache_last_good_ttl: int = 86400  # stale copy served while a provider is backing off
+    provider_backoff_base: int = 30  # seconds after the first failure, doubled per failure
+    provider_backoff_max: int = 1800
+    calendar_range_cache_ttl: int = 600  # seconds a fetched calendar window stays valid
+    
+    # Circuit breakers around upstream providers
+    circuit_breaker_window: int = 20  # recent calls considered per provider
+    circuit_breaker_min_calls: int = 10
+    circuit_breaker_failure_rate: float = 0.5
+    circuit_breaker_slow_call_seconds: float = 5.0
+    circuit_breaker_slow_call_rate: float = 0.8
+    circuit_breaker_open_seconds: int = 30
+    circuit_breaker_half_open_calls: int = 3
     
     class Config:
         env_file = ".env"
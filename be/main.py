@@ -1,16 +1,54 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+import asyncio
 import uvicorn
 import os
 
 # Import routes
 from routes import api_router
+from config.settings import settings
+from services.google_service import run_token_refresher
+from services.jira_sync_service import run_jira_sync_loop
+from services.http_client import http_clients
+from services.cache_service import cache_service
+from routes.dashboards import warm_widget_cache
+from models.database import async_engine
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect the cache and start background jobs; stop them and close pools on shutdown."""
+    await cache_service.connect()
+    background_tasks = []
+    if settings.google_token_refresher_enabled:
+        background_tasks.append(asyncio.create_task(run_token_refresher()))
+    if settings.jira_sync_enabled:
+        background_tasks.append(asyncio.create_task(run_jira_sync_loop()))
+    background_tasks.append(asyncio.create_task(cache_service.run_reconnect_loop()))
+    if cache_service.local is not None:
+        background_tasks.append(asyncio.create_task(cache_service.run_invalidation_listener()))
+    if settings.cache_warmup_enabled:
+        warmup = asyncio.create_task(warm_widget_cache())
+        if settings.cache_warmup_blocking:
+            # Past the timeout the warm-up keeps going while traffic is served
+            await asyncio.wait([warmup], timeout=settings.cache_warmup_timeout)
+        background_tasks.append(warmup)
+    
+    yield
+    
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await http_clients.close()
+    await cache_service.close()
+    await async_engine.dispose()
 
 app = FastAPI(
     title="Productivity Dashboard API",
     description="Aggregates data from multiple productivity services",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Mount static files directory
@@ -0,0 +1,47 @@
+"""
+Alembic environment: migrates the database configured in settings.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+
+from config.settings import settings
+from models.database import Base, build_engine
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Every model is registered on Base.metadata by importing models.database
+target_metadata = Base.metadata
+
+def run_migrations_offline():
+    """Emit the migration SQL instead of running it."""
+    context.configure(
+        url=settings.database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=settings.database_url.startswith("sqlite")
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    """Run the migrations against the database."""
+    engine = build_engine(settings.database_url)
+    with engine.connect() as connection:
+        # SQLite can only change most columns by copying the table
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite"
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,116 @@
+"""Baseline schema, as originally created by Base.metadata.create_all
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+Databases created before migrations already have some or all of these
+tables; existing tables are left untouched and only missing ones are created.
+Columns and tables added since then come in later revisions, which skip
+whatever a newer create_all already made.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Offline (--sql) runs cannot inspect the database and emit the full schema
+    existing = set() if context.is_offline_mode() else set(sa.inspect(op.get_bind()).get_table_names())
+    
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("username", sa.String(), nullable=False),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("id")
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_username", "users", ["username"], unique=True)
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+    
+    if "integrations" not in existing:
+        op.create_table(
+            "integrations",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("service_name", sa.String(), nullable=False),
+            sa.Column("access_token", sa.Text(), nullable=False),
+            sa.Column("refresh_token", sa.Text(), nullable=True),
+            sa.Column("token_expires_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id")
+        )
+        op.create_index("ix_integrations_id", "integrations", ["id"])
+    
+    if "dashboards" not in existing:
+        op.create_table(
+            "dashboards",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("is_default", sa.Boolean(), nullable=True),
+            sa.Column("layout_config", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id")
+        )
+        op.create_index("ix_dashboards_id", "dashboards", ["id"])
+    
+    if "widgets" not in existing:
+        op.create_table(
+            "widgets",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("dashboard_id", sa.Integer(), nullable=False),
+            sa.Column("widget_type", sa.String(), nullable=False),
+            sa.Column("service_name", sa.String(), nullable=False),
+            sa.Column("position_x", sa.Integer(), nullable=True),
+            sa.Column("position_y", sa.Integer(), nullable=True),
+            sa.Column("width", sa.Integer(), nullable=True),
+            sa.Column("height", sa.Integer(), nullable=True),
+            sa.Column("config", sa.Text(), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["dashboard_id"], ["dashboards.id"]),
+            sa.PrimaryKeyConstraint("id")
+        )
+        op.create_index("ix_widgets_id", "widgets", ["id"])
+    
+    if "notes" not in existing:
+        op.create_table(
+            "notes",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("title", sa.String(length=200), nullable=False),
+            sa.Column("content", sa.Text(), nullable=True),
+            sa.Column("is_pinned", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id")
+        )
+        op.create_index("ix_notes_id", "notes", ["id"])
+
+
+
+def downgrade() -> None:
+    for table in ("notes", "widgets", "dashboards", "integrations", "users"):
+        op.drop_table(table)
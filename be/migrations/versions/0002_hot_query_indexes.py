@@ -0,0 +1,41 @@
+"""Indexes for the hot integration, note, widget and dashboard lookups
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+Databases created by create_all after the indexes were added already have them.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    indexes = [
+        ("ix_integrations_user_service_active", "integrations", ["user_id", "service_name", "is_active"]),
+        ("ix_notes_user_pinned_updated", "notes", ["user_id", "is_pinned", "updated_at"]),
+        ("ix_widgets_dashboard_id", "widgets", ["dashboard_id"]),
+        ("ix_dashboards_user_id", "dashboards", ["user_id"])
+    ]
+    existing = set()
+    if not context.is_offline_mode():
+        inspector = sa.inspect(op.get_bind())
+        existing = {index["name"] for _, table, _ in indexes for index in inspector.get_indexes(table)}
+    for name, table, columns in indexes:
+        if name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dashboards_user_id", table_name="dashboards")
+    op.drop_index("ix_widgets_dashboard_id", table_name="widgets")
+    op.drop_index("ix_notes_user_pinned_updated", table_name="notes")
+    op.drop_index("ix_integrations_user_service_active", table_name="integrations")
@@ -0,0 +1,32 @@
+"""Add integrations.config for cached provider metadata
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+Databases created by create_all after the column was added already have it.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode():
+        columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("integrations")}
+        if "config" in columns:
+            return
+    with op.batch_alter_table("integrations") as batch_op:
+        batch_op.add_column(sa.Column("config", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("integrations") as batch_op:
+        batch_op.drop_column("config")
@@ -0,0 +1,37 @@
+"""Add users.last_login_at for the cache warm-up
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+
+Databases created by create_all after the column was added already have it.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns, indexes = set(), set()
+    if not context.is_offline_mode():
+        inspector = sa.inspect(op.get_bind())
+        columns = {column["name"] for column in inspector.get_columns("users")}
+        indexes = {index["name"] for index in inspector.get_indexes("users")}
+    if "last_login_at" not in columns:
+        with op.batch_alter_table("users") as batch_op:
+            batch_op.add_column(sa.Column("last_login_at", sa.DateTime(timezone=True), nullable=True))
+    if "ix_users_last_login_at" not in indexes:
+        op.create_index("ix_users_last_login_at", "users", ["last_login_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_last_login_at", table_name="users")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("last_login_at")
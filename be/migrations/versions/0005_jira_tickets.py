@@ -0,0 +1,48 @@
+"""Add the jira_tickets mirror table
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+
+Databases created by create_all after the table was added already have it.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set() if context.is_offline_mode() else set(sa.inspect(op.get_bind()).get_table_names())
+    if "jira_tickets" in existing:
+        return
+    
+    op.create_table(
+        "jira_tickets",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("integration_id", sa.Integer(), nullable=False),
+        sa.Column("issue_id", sa.String(), nullable=False),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("priority", sa.String(), nullable=True),
+        sa.Column("assignee", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("synced_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+        sa.ForeignKeyConstraint(["integration_id"], ["integrations.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("integration_id", "issue_id", name="uq_jira_tickets_integration_issue")
+    )
+    op.create_index("ix_jira_tickets_id", "jira_tickets", ["id"])
+    op.create_index("ix_jira_tickets_integration_id", "jira_tickets", ["integration_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("jira_tickets")
@@ -1,11 +1,71 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import create_engine, event, Column, Integer, String, DateTime, Text, Boolean, ForeignKey, Index
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.sql import func
 from config.settings import settings
 
-engine = create_engine(settings.database_url)
+# Async driver for each sync database URL scheme
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg"
+}
+
+def async_database_url(url: str) -> str:
+    """Rewrite a database URL to use the async driver for its database."""
+    scheme, separator, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+def _engine_options(url: str) -> dict:
+    """Connection and pool options for the database behind a URL."""
+    if url.startswith("sqlite"):
+        # Connections move between threads (to_thread, run_sync); on a lock, wait instead of failing
+        return {"connect_args": {"check_same_thread": False, "timeout": settings.sqlite_busy_timeout}}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": True
+    }
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    if settings.sqlite_wal_enabled:
+        # Readers no longer wait for the writer; NORMAL sync is crash-safe under WAL
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size}")
+    cursor.execute(f"PRAGMA cache_size=-{settings.sqlite_cache_size_kb}")  # negative means KiB
+    cursor.close()
+
+def build_engine(url: str) -> Engine:
+    """Create a sync engine with the configured pool, or SQLite pragmas."""
+    db_engine = create_engine(url, **_engine_options(url))
+    if url.startswith("sqlite"):
+        event.listen(db_engine, "connect", _apply_sqlite_pragmas)
+    return db_engine
+
+def build_async_engine(url: str) -> AsyncEngine:
+    """Create an async engine for a sync database URL, configured like build_engine."""
+    db_engine = create_async_engine(async_database_url(url), **_engine_options(url))
+    if url.startswith("sqlite"):
+        event.listen(db_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return db_engine
+
+# Sync engine for background loops, Celery tasks and scripts
+engine = build_engine(settings.database_url)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engine for request handlers, so slow queries do not block the event loop.
+# Objects stay loaded after commit because lazy loads cannot run outside an await.
+async_engine = build_async_engine(settings.database_url)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 class User(Base):
@@ -16,6 +76,7 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
+    last_login_at = Column(DateTime(timezone=True), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -26,6 +87,10 @@ class User(Base):
 
 class Integration(Base):
     __tablename__ = "integrations"
+    __table_args__ = (
+        # Active integration of a user for one service, looked up on every widget load
+        Index("ix_integrations_user_service_active", "user_id", "service_name", "is_active"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -33,6 +98,7 @@ class Integration(Base):
     access_token = Column(Text, nullable=False)
     refresh_token = Column(Text)
     token_expires_at = Column(DateTime(timezone=True))
+    config = Column(Text)  # JSON provider metadata, e.g. Jira cloud_id and accountId
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -44,7 +110,7 @@ class Dashboard(Base):
     __tablename__ = "dashboards"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     description = Column(Text)
     is_default = Column(Boolean, default=False)
@@ -60,7 +126,7 @@ class Widget(Base):
     __tablename__ = "widgets"
     
     id = Column(Integer, primary_key=True, index=True)
-    dashboard_id = Column(Integer, ForeignKey("dashboards.id"), nullable=False)
+    dashboard_id = Column(Integer, ForeignKey("dashboards.id"), nullable=False, index=True)
     widget_type = Column(String, nullable=False)  # calendar, tasks, prs, tickets, emails
     service_name = Column(String, nullable=False)  # github, google, jira, etc.
     position_x = Column(Integer, default=0)
@@ -75,11 +141,9 @@ class Widget(Base):
     # Relationships
     dashboard = relationship("Dashboard", back_populates="widgets")
 
-# Import Note model BEFORE creating tables
+# Register Note and JiraTicket on Base.metadata; the schema itself is managed by Alembic
 from models.notes import Note
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+from models.jira import JiraTicket
 
 # Dependency to get DB session
 def get_db():
@@ -88,3 +152,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
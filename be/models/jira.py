@@ -0,0 +1,25 @@
+"""
+Local mirror of Jira tickets assigned to a user.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from models.database import Base
+
+class JiraTicket(Base):
+    """A Jira issue mirrored for one Jira integration."""
+    __tablename__ = "jira_tickets"
+    __table_args__ = (
+        UniqueConstraint("integration_id", "issue_id", name="uq_jira_tickets_integration_issue"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    integration_id = Column(Integer, ForeignKey("integrations.id"), nullable=False, index=True)
+    issue_id = Column(String, nullable=False)
+    key = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    status = Column(String)
+    priority = Column(String)
+    assignee = Column(String)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    synced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
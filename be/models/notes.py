@@ -1,7 +1,7 @@
 """
 Notes model for internal note-taking functionality.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from models.database import Base
@@ -9,6 +9,10 @@ from models.database import Base
 class Note(Base):
     """Model for user notes."""
     __tablename__ = "notes"
+    __table_args__ = (
+        # Serves the note list: a user's notes, pinned first, most recently updated first
+        Index("ix_notes_user_pinned_updated", "user_id", "is_pinned", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
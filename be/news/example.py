@@ -3,10 +3,11 @@ Example usage of the news service.
 """
 import os
 import json
+import asyncio
 from news import get_news_by_company, get_news_by_domain
 from news.service import NewsBase
 
-def main():
+async def main():
     """
     Demonstrate the usage of the news service functions.
     """
@@ -14,7 +15,7 @@ def main():
     
     # Example 1: Get news by company name
     print("=== News for PhonePe ===")
-    phonepe_news = get_news_by_company("PhonePe", days=15, limit=3)
+    phonepe_news = await get_news_by_company("PhonePe", days=15, limit=3)
     
     # Print news items using the NewsBase class
     for article in phonepe_news:
@@ -29,7 +30,7 @@ def main():
     
     # Example 2: Get news by domain
     print("=== News for Fintech Domain ===")
-    fintech_news = get_news_by_domain("fintech", days=15, limit=10)
+    fintech_news = await get_news_by_domain("fintech", days=15, limit=10)
     
     # Print one article from each company
     for company, articles in fintech_news.items():
@@ -51,4 +52,4 @@ if __name__ == "__main__":
         # Uncomment and set your API key here for testing with real data
         # os.environ["NEWS_API_KEY"] = "your-api-key-here"
     
-    main()
+    asyncio.run(main())
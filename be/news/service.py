@@ -2,12 +2,13 @@
 News service for fetching competitor news by company name or domain.
 """
 import os
-import requests
+import asyncio
 from typing import List, Dict, Any, Optional, Union
 import logging
 from dataclasses import dataclass
 
 from config.settings import settings
+from services.http_client import http_clients
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -42,7 +43,7 @@ class NewsService:
     """Service for fetching news related to companies or domains."""
     
     @staticmethod
-    def get_news_by_company(company_name: str, days: int = 30, limit: int = 10) -> List[NewsBase]:
+    async def get_news_by_company(company_name: str, days: int = 30, limit: int = 10) -> List[NewsBase]:
         """
         Get news articles related to a specific company.
         
@@ -68,7 +69,7 @@ class NewsService:
                 "from": f"{days}d"  # Last X days
             }
             
-            response = requests.get(NEWS_API_URL, params=params)
+            response = await http_clients.for_url(NEWS_API_URL).get(NEWS_API_URL, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -93,7 +94,7 @@ class NewsService:
             return NewsService._get_mock_news(company_name, limit)
     
     @staticmethod
-    def get_news_by_domain(domain: str, days: int = 30, limit: int = 20) -> Dict[str, List[NewsBase]]:
+    async def get_news_by_domain(domain: str, days: int = 30, limit: int = 20) -> Dict[str, List[NewsBase]]:
         """
         Get news articles related to companies in a specific domain.
         
@@ -115,11 +116,13 @@ class NewsService:
         # Calculate articles per company to stay within limit
         articles_per_company = max(1, limit // len(companies))
         
-        result = {}
-        for company in companies:
-            result[company] = NewsService.get_news_by_company(company, days, articles_per_company)
-            
-        return result
+        # Query every company concurrently over the shared connection pool
+        results = await asyncio.gather(*[
+            NewsService.get_news_by_company(company, days, articles_per_company)
+            for company in companies
+        ])
+        
+        return dict(zip(companies, results))
     
     @staticmethod
     def _get_mock_news(query: str, limit: int = 5) -> List[NewsBase]:
@@ -180,4 +183,4 @@ class NewsService:
 
 
 if __name__ == "__main__":
-    print(NewsService.get_news_by_domain("fintech", limit=5))
\ No newline at end of file
+    print(asyncio.run(NewsService.get_news_by_domain("fintech", limit=5)))
\ No newline at end of file
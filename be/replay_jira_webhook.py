@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded Jira webhook against a locally running API.
+
+Usage: JIRA_WEBHOOK_SECRET=... python replay_jira_webhook.py [fixture.json]
+"""
+import hashlib
+import hmac
+import os
+import sys
+import requests
+
+BASE_URL = "http://localhost:8000"
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "jira_issue_updated.json")
+
+def replay(fixture_path: str):
+    """Post the fixture to /webhooks/jira, signed like Jira signs it."""
+    with open(fixture_path, "rb") as f:
+        body = f.read()
+    
+    headers = {"Content-Type": "application/json"}
+    secret = os.environ.get("JIRA_WEBHOOK_SECRET")
+    if secret:
+        signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        headers["X-Hub-Signature"] = f"sha256={signature}"
+    else:
+        print("Note: JIRA_WEBHOOK_SECRET not set, sending an unsigned request.")
+    
+    response = requests.post(f"{BASE_URL}/webhooks/jira", data=body, headers=headers)
+    print(f"Status: {response.status_code}")
+    print(f"Response: {response.json()}")
+
+if __name__ == "__main__":
+    replay(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FIXTURE)
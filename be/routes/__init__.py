@@ -10,6 +10,7 @@ from .news import router as news_router
 from .notes import router as notes_router
 from .health import router as health_router
 from .calendar import router as calendar_router
+from .webhooks import router as webhooks_router
 
 # Create a main router to include all other routers
 api_router = APIRouter()
@@ -22,3 +23,4 @@ api_router.include_router(news_router,  tags=["news"])
 api_router.include_router(notes_router , tags=["notes"])
 api_router.include_router(health_router , tags=["health"])
 api_router.include_router(calendar_router, tags=["calender"])
+api_router.include_router(webhooks_router, tags=["webhooks"])
@@ -3,11 +3,12 @@ Authentication routes for user registration and login.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from datetime import timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta, timezone
 
 from config.settings import settings
-from models.database import get_db, User as DBUser, Dashboard
+from models.database import get_async_db, User as DBUser, Dashboard
 from schemas.models import User, UserCreate, Token
 from utils.auth import (
     authenticate_user, create_access_token, get_current_active_user,
@@ -20,17 +21,17 @@ router = APIRouter(
 )
 
 @router.post("/register", response_model=User)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
     # Check if user already exists
-    db_user = db.query(DBUser).filter(DBUser.username == user.username).first()
+    db_user = await db.scalar(select(DBUser).where(DBUser.username == user.username))
     if db_user:
         raise HTTPException(
             status_code=400,
             detail="Username already registered"
         )
     
-    db_user = db.query(DBUser).filter(DBUser.email == user.email).first()
+    db_user = await db.scalar(select(DBUser).where(DBUser.email == user.email))
     if db_user:
         raise HTTPException(
             status_code=400,
@@ -45,8 +46,8 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     # Create default dashboard
     default_dashboard = Dashboard(
@@ -56,20 +57,24 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         is_default=True
     )
     db.add(default_dashboard)
-    db.commit()
+    await db.commit()
     
     return db_user
 
 @router.post("/token", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """Authenticate user and return access token."""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    # The startup cache warm-up picks users by their last login
+    user.last_login_at = datetime.now(timezone.utc)
+    await db.commit()
+    
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
@@ -2,25 +2,39 @@
 Calendar routes for fetching meeting data from Google Calendar.
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 from datetime import datetime, timedelta
+import contextlib
 import json
 
 from models.database import get_db, User as DBUser, Integration
 from utils.auth import get_current_active_user
 from services.google_service import GoogleService
+from services.calendar_cache import calendar_range_cache
 
 router = APIRouter(
     prefix="/calendar",
     tags=["calendar"]
 )
 
+async def _stream_events_ndjson(google_service: GoogleService, start: datetime, end: datetime) -> AsyncIterator[str]:
+    """Yield one JSON document per calendar event, then an error line if paging fails."""
+    try:
+        async with contextlib.aclosing(google_service.iter_calendar_events(start, end)) as events:
+            async for event in events:
+                yield json.dumps(event.dict(), default=str) + "\n"
+    except Exception as e:
+        print(f"Error streaming calendar events: {e}")
+        yield json.dumps({"error": f"Failed to fetch calendar events: {str(e)}"}) + "\n"
+
 @router.get("/meetings")
 async def get_meetings(
     start_date: Optional[str] = Query(None, description="Start date in ISO format (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date in ISO format (YYYY-MM-DD)"),
     days: Optional[int] = Query(30, description="Number of days to fetch if start/end dates not provided"),
+    stream: bool = Query(False, description="Stream every event in the range as NDJSON, sorted by start time"),
     current_user: DBUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
@@ -29,6 +43,9 @@ async def get_meetings(
     
     If start_date and end_date are not provided, it will fetch meetings for the specified
     number of days (default: 30) from today.
+    
+    With stream=true the events of all the user's calendars are streamed as
+    newline-delimited JSON while they are still being paged from Google.
     """
     # Check if user has Google integration
     integration = db.query(Integration).filter(
@@ -61,16 +78,25 @@ async def get_meetings(
         )
     
     # Initialize Google service with user's tokens
-    google_service = GoogleService(
-        access_token=integration.access_token,
-        refresh_token=integration.refresh_token
-    )
+    google_service = GoogleService.from_integration(integration)
     
-    # Fetch calendar events
-    events = await google_service.get_calendar_events(
-        start_date=start_datetime,
-        end_date=end_datetime
-    )
+    if stream:
+        return StreamingResponse(
+            _stream_events_ndjson(google_service, start_datetime, end_datetime),
+            media_type="application/x-ndjson"
+        )
+    
+    # Fetch calendar events, only asking Google for windows not cached yet
+    try:
+        events = await calendar_range_cache.get_events(
+            current_user.id,
+            google_service,
+            start_datetime,
+            end_datetime
+        )
+    except Exception as e:
+        print(f"Error fetching calendar events: {e}")
+        events = []
     
     return {
         "start_date": start_datetime.isoformat(),
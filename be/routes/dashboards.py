@@ -2,119 +2,251 @@
 Dashboard routes for managing user dashboards and widgets.
 """
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 import json
+import time
 import asyncio
 
-from models.database import get_db, User as DBUser, Integration, Dashboard, Widget
+from models.database import get_async_db, AsyncSessionLocal, User as DBUser, Integration, Dashboard, Widget
 from schemas.models import (
     Dashboard as DashboardSchema, DashboardCreate, DashboardWithWidgets, 
     DashboardWithWidgetsAndData, Widget as WidgetSchema, WidgetWithData, 
-    WidgetCreate, DashboardData
+    WidgetCreate, DashboardData, Ticket
 )
 from utils.auth import get_current_active_user
 from services.github_service import GitHubService
 from services.google_service import GoogleService
-from services.jira_service import JiraService
+from services.jira_service import JiraService, load_integration_config
+from services.jira_sync_service import JiraSyncService, sync_integration
 from services.cache_service import cache_service
+from services.cache_stats import cache_stats
+from services.provider_backoff import classify_error, provider_backoff
+from services.circuit_breaker import CircuitOpenError, circuit_breakers
 from config.settings import settings
 
 router = APIRouter(
     tags=["dashboards"]
 )
 
+# Upstream providers whose transient failures put a user's widgets into backoff
+BACKOFF_SERVICES = {"google", "github", "jira"}
+BACKOFF_ERROR_TYPES = {"rate_limit", "server_error", "unavailable"}
+
+def _last_good_endpoint(widget_type: str) -> str:
+    """Cache endpoint of the long-lived copy served while a provider is failing."""
+    return f"{widget_type}:last_good"
+
 # Helper function to fetch widget data
-def _cache_and_return(data: dict, user_id: int, service_name: str, widget_type: str, cache_params: dict, ttl: int = 600) -> dict:
-    """Helper function to cache data and return it."""
-    cache_service.set(user_id, service_name, widget_type, data, cache_params, ttl)
+async def _cache_and_return(data: dict, user_id: int, service_name: str, widget_type: str, cache_params: dict, ttl: int = 600, started: float = None) -> dict:
+    """Helper function to cache data, and a long-lived last good copy of it, and return it.
+    
+    started is the time.monotonic() at which fetching the data began; it sets
+    the compute time XFetch uses to decide how early to refresh.
+    """
+    entries = [(service_name, widget_type, data, cache_params, ttl)]
+    # An error must never replace the copy served while the provider is failing
+    if "error" not in data:
+        entries.append((service_name, _last_good_endpoint(widget_type), data, cache_params, settings.cache_last_good_ttl))
+    compute_time = time.monotonic() - started if started is not None else None
+    await cache_service.set_many(user_id, entries, compute_time=compute_time)
     return data
 
-async def _fetch_widget_data(widget: Widget, user_id: int, db: Session) -> dict:
+# Jira widgets served from the combined "my work" search, by widget type
+JIRA_MY_WORK_WIDGETS = {
+    "reported_tickets": "reported",
+    "watching_tickets": "watching",
+    "activity": "activity"
+}
+# Items fetched per category so widgets with different limits share one search
+JIRA_MY_WORK_LIMIT = 25
+
+async def _get_jira_my_work(integration: Integration, user_id: int, limit: int) -> dict:
+    """Get the combined reported/watching/activity search, shared by all Jira widgets."""
+    cache_params = {"limit": max(limit, JIRA_MY_WORK_LIMIT)}
+    cached_data = await cache_service.get(user_id, "jira", "my_work", cache_params)
+    if cached_data:
+        return cached_data
+    
+    started = time.monotonic()
+    jira_service = JiraService.from_integration(integration)
+    my_work = await jira_service.get_my_work(limit=cache_params["limit"])
+    data = {
+        "reported": [ticket.dict() for ticket in my_work["reported"]],
+        "watching": [ticket.dict() for ticket in my_work["watching"]],
+        "activity": my_work["activity"]
+    }
+    return await _cache_and_return(data, user_id, "jira", "my_work", cache_params, ttl=settings.jira_cache_ttl, started=started)
+
+def _widget_cache_params(widget: Widget) -> dict:
+    """Cache params identifying a widget's data."""
+    return {"widget_type": widget.widget_type, "config": widget.config}
+
+async def _read_jira_mirror(db: AsyncSession, integration: Integration, limit: int) -> Tuple[List[Ticket], int]:
+    """Read tickets from an integration's Jira mirror, filling it first if it never synced."""
+    if "last_sync" not in load_integration_config(integration):
+        # The mirror service works on sync sessions, so the first sync uses one of its own
+        await sync_integration(integration.id)
+    
+    def read(session: Session) -> Tuple[List[Ticket], int]:
+        sync_service = JiraSyncService(session, integration)
+        return sync_service.get_tickets(limit=limit), sync_service.count_tickets()
+    
+    return await db.run_sync(read)
+
+async def _fetch_widget_data(widget: Widget, user_id: int, db: AsyncSession, check_cache: bool = True) -> dict:
     """Fetch live data for a widget based on its service and type."""
-    try:
+    cache_params = _widget_cache_params(widget)
+    if check_cache:
         # Try to get data from cache first
-        cache_params = {"widget_type": widget.widget_type, "config": widget.config}
-        cached_data = cache_service.get(user_id, widget.service_name, widget.widget_type, cache_params)
+        cached_data = await cache_service.get(user_id, widget.service_name, widget.widget_type, cache_params)
         
         if cached_data:
             print(f"Cache HIT for {widget.service_name}:{widget.widget_type}")
             return cached_data
+    
+    # Answer right away while the provider's circuit is open instead of waiting on timeouts
+    if circuit_breakers.is_open(widget.service_name):
+        breaker = circuit_breakers.get(widget.service_name)
+        return await _widget_fallback(widget, user_id, cache_params, _circuit_open_state(breaker.retry_at))
+    
+    # Leave a failing provider alone until its backoff runs out
+    backoff_state = await provider_backoff.get_state(user_id, widget.service_name)
+    if provider_backoff.is_active(backoff_state):
+        return await _widget_fallback(widget, user_id, cache_params, backoff_state)
+    
+    print(f"Cache MISS for {widget.service_name}:{widget.widget_type} - fetching from API")
+    try:
+        data = await _load_widget_data(widget, user_id, db, cache_params)
+    except CircuitOpenError as e:
+        # A provider-wide outage is not this user's failure, so no per-user backoff
+        return await _widget_fallback(widget, user_id, cache_params, _circuit_open_state(e.retry_at))
+    except Exception as e:
+        if widget.service_name not in BACKOFF_SERVICES or classify_error(e) not in BACKOFF_ERROR_TYPES:
+            # Local bugs and permanent errors are reported as-is; waiting will not fix them
+            print(f"Failed to fetch {widget.service_name}:{widget.widget_type} for user {user_id}: {e}")
+            return {"error": f"Failed to fetch data: {str(e)}"}
+        backoff_state = await provider_backoff.record_failure(user_id, widget.service_name, e, backoff_state)
+        return await _widget_fallback(widget, user_id, cache_params, backoff_state)
+    
+    if backoff_state:
+        await provider_backoff.reset(user_id, widget.service_name)
+    return data
+
+def _circuit_open_state(retry_at: float) -> dict:
+    """Failure state reported while a provider's circuit breaker is open."""
+    return {"error_type": "circuit_open", "message": "provider temporarily unavailable", "retry_at": retry_at}
+
+async def _widget_fallback(widget: Widget, user_id: int, cache_params: dict, backoff_state: dict) -> dict:
+    """Serve the last good data of a widget whose provider is failing, or the error if there is none."""
+    last_good = await cache_service.get(user_id, widget.service_name, _last_good_endpoint(widget.widget_type), cache_params)
+    cache_stats.record_fallback(widget.service_name, widget.widget_type, stale=bool(last_good))
+    if last_good:
+        return {**last_good, "stale": True, "error_type": backoff_state["error_type"]}
+    return {
+        "error": f"Failed to fetch data: {backoff_state['message']}",
+        "error_type": backoff_state["error_type"],
+        "retry_after": max(0, int(backoff_state["retry_at"] - time.time()))
+    }
+
+async def _load_widget_data(widget: Widget, user_id: int, db: AsyncSession, cache_params: dict) -> dict:
+    """Fetch a widget's data from its provider and cache it. Provider errors propagate."""
+    started = time.monotonic()
+    # Get the integration for this service
+    integration = await db.scalar(select(Integration).where(
+        Integration.user_id == user_id,
+        Integration.service_name == widget.service_name,
+        Integration.is_active == True
+    ))
+    
+    if not integration:
+        return {"error": f"No active {widget.service_name} integration found"}
+    
+    # Fetch data based on service type
+    if widget.service_name == "github":
+        github_service = GitHubService(integration.access_token)
+        
+        if widget.widget_type == "pull_requests":
+            limit = widget.config.get("limit", 10) if widget.config else 10
+            prs = github_service.get_pull_requests(limit=limit)
+            data = {"pull_requests": [pr.dict() for pr in prs]}
+            return await _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params, started=started)
         
-        print(f"Cache MISS for {widget.service_name}:{widget.widget_type} - fetching from API")
+        elif widget.widget_type == "issues":
+            limit = widget.config.get("limit", 10) if widget.config else 10
+            issues = github_service.get_assigned_issues(limit=limit)
+            data = {"issues": issues}
+            return await _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params, started=started)
         
-        # Get the integration for this service
-        integration = db.query(Integration).filter(
-            Integration.user_id == user_id,
-            Integration.service_name == widget.service_name,
-            Integration.is_active == True
-        ).first()
+        elif widget.widget_type == "notifications":
+            limit = widget.config.get("limit", 10) if widget.config else 10
+            notifications = github_service.get_notifications(limit=limit)
+            data = {"notifications": notifications}
+            return await _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params, started=started)
+    
+    elif widget.service_name == "google":
+        google_service = GoogleService.from_integration(integration)
+        
+        if widget.widget_type == "calendar":
+            limit = widget.config.get("limit", 10) if widget.config else 10
+            events = await google_service.get_calendar_events(limit=limit)
+            data = {"events": [event.dict() for event in events]}
+            return await _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params, started=started)
         
-        if not integration:
-            return {"error": f"No active {widget.service_name} integration found"}
+        elif widget.widget_type == "tasks":
+            limit = widget.config.get("limit", 10) if widget.config else 10
+            tasks = await google_service.get_tasks(limit=limit)
+            data = {"tasks": [task.dict() for task in tasks]}
+            return await _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params, started=started)
         
-        # Fetch data based on service type
-        if widget.service_name == "github":
-            github_service = GitHubService(integration.access_token)
-            
-            if widget.widget_type == "pull_requests":
-                limit = widget.config.get("limit", 10) if widget.config else 10
-                prs = github_service.get_pull_requests(limit=limit)
-                data = {"pull_requests": [pr.dict() for pr in prs]}
-                return _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params)
-            
-            elif widget.widget_type == "issues":
-                limit = widget.config.get("limit", 10) if widget.config else 10
-                issues = github_service.get_assigned_issues(limit=limit)
-                data = {"issues": issues}
-                return _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params)
-            
-            elif widget.widget_type == "notifications":
-                limit = widget.config.get("limit", 10) if widget.config else 10
-                notifications = github_service.get_notifications(limit=limit)
-                data = {"notifications": notifications}
-                return _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params)
+        elif widget.widget_type == "emails":
+            limit = widget.config.get("limit", 10) if widget.config else 10
+            emails = await google_service.get_emails(limit=limit)
+            data = {"emails": [email.dict() for email in emails]}
+            return await _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params, started=started)
+    
+    elif widget.service_name == "jira":
+        if widget.widget_type == "tickets":
+            limit = widget.config.get("limit", 10) if widget.config else 10
+            # Served from the local ticket mirror, which the sync loop keeps current
+            tickets, total = await _read_jira_mirror(db, integration, limit)
+            return {"tickets": [ticket.dict() for ticket in tickets], "total": total}
         
-        elif widget.service_name == "google":
-            google_service = GoogleService(integration.access_token, integration.refresh_token or "")
-            
-            if widget.widget_type == "calendar":
-                limit = widget.config.get("limit", 10) if widget.config else 10
-                events = await google_service.get_calendar_events(limit=limit)
-                data = {"events": [event.dict() for event in events]}
-                return _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params)
-            
-            elif widget.widget_type == "tasks":
-                limit = widget.config.get("limit", 10) if widget.config else 10
-                tasks = await google_service.get_tasks(limit=limit)
-                data = {"tasks": [task.dict() for task in tasks]}
-                return _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params)
-            
-            elif widget.widget_type == "emails":
-                limit = widget.config.get("limit", 10) if widget.config else 10
-                emails = await google_service.get_emails(limit=limit)
-                data = {"emails": [email.dict() for email in emails]}
-                return _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params)
+        elif widget.widget_type in JIRA_MY_WORK_WIDGETS:
+            limit = widget.config.get("limit", 10) if widget.config else 10
+            my_work = await _get_jira_my_work(integration, user_id, limit)
+            category = JIRA_MY_WORK_WIDGETS[widget.widget_type]
+            data = {category: my_work[category][:limit]}
+            return await _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params, ttl=settings.jira_cache_ttl, started=started)
+    
+    elif widget.service_name == "notes":
+        # Notes is an internal service, no integration record needed
+        from services.notes_service import NotesService
+        notes_service = NotesService(db, user_id)
         
-        elif widget.service_name == "jira":
-            jira_service = JiraService(integration.access_token, settings.jira_server)
-            
-            if widget.widget_type == "tickets":
-                limit = widget.config.get("limit", 10) if widget.config else 10
-                tickets = await jira_service.get_assigned_tickets(limit=limit)
-                data = {"tickets": [ticket.dict() for ticket in tickets]}
-                return _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params)
+        if widget.widget_type == "notes_list":
+            limit = widget.config.get("limit", 10) if widget.config else 10
+            pinned_only = widget.config.get("pinned_only", False) if widget.config else False
+            notes = await notes_service.get_notes(limit=limit, pinned_only=pinned_only)
+            data = {"notes": [{
+                "id": note.id,
+                "title": note.title,
+                "content": note.content,
+                "is_pinned": note.is_pinned,
+                "created_at": note.created_at,
+                "updated_at": note.updated_at
+            } for note in notes]}
+            return await _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params, ttl=300, started=started)
         
-        elif widget.service_name == "notes":
-            # Notes is an internal service, no integration record needed
-            from services.notes_service import NotesService
-            notes_service = NotesService(db, user_id)
-            
-            if widget.widget_type == "notes_list":
-                limit = widget.config.get("limit", 10) if widget.config else 10
-                pinned_only = widget.config.get("pinned_only", False) if widget.config else False
-                notes = notes_service.get_notes(limit=limit, pinned_only=pinned_only)
-                data = {"notes": [{
+        elif widget.widget_type == "notes_search":
+            query = widget.config.get("query", "") if widget.config else ""
+            limit = widget.config.get("limit", 10) if widget.config else 10
+            if query:
+                notes = await notes_service.search_notes(query, limit=limit)
+                return {"search_results": [{
                     "id": note.id,
                     "title": note.title,
                     "content": note.content,
@@ -122,49 +254,66 @@ async def _fetch_widget_data(widget: Widget, user_id: int, db: Session) -> dict:
                     "created_at": note.created_at,
                     "updated_at": note.updated_at
                 } for note in notes]}
-                return _cache_and_return(data, user_id, widget.service_name, widget.widget_type, cache_params, ttl=300)
-            
-            elif widget.widget_type == "notes_search":
-                query = widget.config.get("query", "") if widget.config else ""
-                limit = widget.config.get("limit", 10) if widget.config else 10
-                if query:
-                    notes = notes_service.search_notes(query, limit=limit)
-                    return {"search_results": [{
-                        "id": note.id,
-                        "title": note.title,
-                        "content": note.content,
-                        "is_pinned": note.is_pinned,
-                        "created_at": note.created_at,
-                        "updated_at": note.updated_at
-                    } for note in notes]}
-                else:
-                    return {"search_results": []}
-        
-        data = {"error": f"Unsupported widget type: {widget.widget_type} for service: {widget.service_name}"}
-        # Cache error responses for shorter time (1 minute) to retry sooner
-        cache_service.set(user_id, widget.service_name, widget.widget_type, data, cache_params, ttl=60)
-        return data
+            else:
+                return {"search_results": []}
     
-    except Exception as e:
-        error_data = {"error": f"Failed to fetch data: {str(e)}"}
-        # Cache error responses for shorter time (1 minute)
-        cache_service.set(user_id, widget.service_name, widget.widget_type, error_data, cache_params, ttl=60)
-        return error_data
+    data = {"error": f"Unsupported widget type: {widget.widget_type} for service: {widget.service_name}"}
+    # Cache error responses for shorter time (1 minute) to retry sooner
+    await cache_service.set(user_id, widget.service_name, widget.widget_type, data, cache_params, ttl=60)
+    return data
+
+async def warm_widget_cache() -> int:
+    """Pre-populate the widget cache of recently active users; returns how many widgets were loaded."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.cache_warmup_active_hours)
+    async with AsyncSessionLocal() as db:
+        user_ids = (await db.scalars(select(DBUser.id).where(
+            DBUser.is_active == True,
+            DBUser.last_login_at >= cutoff
+        ).order_by(DBUser.last_login_at.desc()).limit(settings.cache_warmup_max_users))).all()
+        rows = (await db.execute(select(Widget, Dashboard.user_id).join(Dashboard, Widget.dashboard_id == Dashboard.id).where(
+            Dashboard.user_id.in_(user_ids),
+            Widget.is_active == True
+        ))).all() if user_ids else []
+    
+    # Most recently active users first; widgets sharing a cache entry are loaded once
+    rank = {user_id: position for position, user_id in enumerate(user_ids)}
+    targets, seen = [], set()
+    for widget, user_id in sorted(rows, key=lambda row: rank[row[1]]):
+        cache_key = (user_id, widget.service_name, widget.widget_type, widget.config)
+        if cache_key not in seen:
+            seen.add(cache_key)
+            targets.append((widget, user_id))
+    
+    semaphore = asyncio.Semaphore(settings.cache_warmup_concurrency)
+    
+    async def warm(widget: Widget, user_id: int) -> bool:
+        async with semaphore, AsyncSessionLocal() as widget_db:
+            try:
+                # Entries another worker already cached are only read, which fills this worker's L1
+                data = await _fetch_widget_data(widget, user_id, widget_db)
+                return "error" not in data
+            except Exception as e:
+                print(f"Cache warm-up failed for widget {widget.id}: {e}")
+                return False
+    
+    results = await asyncio.gather(*(warm(widget, user_id) for widget, user_id in targets))
+    print(f"Cache warm-up loaded {sum(results)} of {len(results)} widget(s) for {len(user_ids)} user(s)")
+    return sum(results)
 
 @router.get("/dashboards", response_model=List[DashboardSchema])
 async def get_user_dashboards(
     current_user: DBUser = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all dashboards for the current user."""
-    dashboards = db.query(Dashboard).filter(Dashboard.user_id == current_user.id).all()
+    dashboards = (await db.scalars(select(Dashboard).where(Dashboard.user_id == current_user.id))).all()
     return dashboards
 
 @router.post("/dashboards", response_model=DashboardSchema)
 async def create_dashboard(
     dashboard: DashboardCreate,
     current_user: DBUser = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new dashboard."""
     import json
@@ -186,14 +335,14 @@ async def create_dashboard(
         layout_config=layout_config_json
     )
     db.add(db_dashboard)
-    db.commit()
-    db.refresh(db_dashboard)
+    await db.commit()
+    await db.refresh(db_dashboard)
     
     # Auto-add Notes integration if it doesn't exist
-    notes_integration = db.query(Integration).filter(
+    notes_integration = await db.scalar(select(Integration).where(
         Integration.user_id == current_user.id,
         Integration.service_name == "notes"
-    ).first()
+    ))
     
     if not notes_integration:
         notes_integration = Integration(
@@ -204,8 +353,8 @@ async def create_dashboard(
             metadata=json.dumps({"type": "internal", "service": "notes"})
         )
         db.add(notes_integration)
-        db.commit()
-        db.refresh(notes_integration)
+        await db.commit()
+        await db.refresh(notes_integration)
     
     # Add default Notes widget to the new dashboard
     default_notes_widget = Widget(
@@ -219,7 +368,7 @@ async def create_dashboard(
         config=json.dumps({"limit": 10, "pinned_only": False})
     )
     db.add(default_notes_widget)
-    db.commit()
+    await db.commit()
     
     return db_dashboard
 
@@ -227,23 +376,30 @@ async def create_dashboard(
 async def get_dashboard(
     dashboard_id: int,
     current_user: DBUser = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific dashboard with its widgets and live data."""
-    dashboard = db.query(Dashboard).filter(
+    dashboard = await db.scalar(select(Dashboard).where(
         Dashboard.id == dashboard_id,
         Dashboard.user_id == current_user.id
-    ).first()
+    ))
     
     if not dashboard:
         raise HTTPException(status_code=404, detail="Dashboard not found")
     
-    widgets = db.query(Widget).filter(Widget.dashboard_id == dashboard_id).all()
+    widgets = (await db.scalars(select(Widget).where(Widget.dashboard_id == dashboard_id))).all()
+    
+    # Look up every widget's cached data in one round trip, then fetch the misses live
+    cached_widget_data = await cache_service.get_many(current_user.id, [
+        (widget.service_name, widget.widget_type, _widget_cache_params(widget)) for widget in widgets
+    ])
     
-    # Fetch live data for each widget
     widgets_with_data = []
-    for widget in widgets:
-        widget_data = await _fetch_widget_data(widget, current_user.id, db)
+    for widget, cached_data in zip(widgets, cached_widget_data):
+        if cached_data:
+            widget_data = cached_data
+        else:
+            widget_data = await _fetch_widget_data(widget, current_user.id, db, check_cache=False)
         widget_with_data = WidgetWithData(
             id=widget.id,
             dashboard_id=widget.dashboard_id,
@@ -279,24 +435,24 @@ async def create_integration_widget(
     dashboard_id: int,
     widget: WidgetCreate,
     current_user: DBUser = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new widget from an integration service for a specific dashboard."""
     # Check if dashboard exists and belongs to user
-    dashboard = db.query(Dashboard).filter(
+    dashboard = await db.scalar(select(Dashboard).where(
         Dashboard.id == dashboard_id,
         Dashboard.user_id == current_user.id
-    ).first()
+    ))
     
     if not dashboard:
         raise HTTPException(status_code=404, detail="Dashboard not found")
     
     # Verify that the user has an active integration for the service
-    integration = db.query(Integration).filter(
+    integration = await db.scalar(select(Integration).where(
         Integration.user_id == current_user.id,
         Integration.service_name == widget.service_name,
         Integration.is_active == True
-    ).first()
+    ))
     
     if not integration:
         raise HTTPException(
@@ -320,22 +476,22 @@ async def create_integration_widget(
     )
     
     db.add(db_widget)
-    db.commit()
-    db.refresh(db_widget)
+    await db.commit()
+    await db.refresh(db_widget)
     return db_widget
 
 @router.get("/dashboard/data", response_model=DashboardData)
 async def get_dashboard_data(
     dashboard_id: Optional[int] = None,
     current_user: DBUser = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get aggregated data for dashboard."""
     # Get user's integrations
-    integrations = db.query(Integration).filter(
+    integrations = (await db.scalars(select(Integration).where(
         Integration.user_id == current_user.id,
         Integration.is_active == True
-    ).all()
+    ))).all()
     
     integration_map = {integration.service_name: integration for integration in integrations}
     
@@ -355,30 +511,25 @@ async def get_dashboard_data(
     
     # Google data
     if 'google' in integration_map:
-        google_service = GoogleService(
-            integration_map['google'].access_token,
-            integration_map['google'].refresh_token
-        )
+        google_service = GoogleService.from_integration(integration_map['google'])
+        # Each source fails on its own so one broken API does not hide the others
+        try:
+            dashboard_data.calendar_events = await google_service.get_calendar_events(limit=10)
+        except Exception as e:
+            print(f"Error fetching Google calendar data: {e}")
         try:
-            events = await google_service.get_calendar_events(limit=10)
-            google_tasks = await google_service.get_tasks(limit=10)
-            emails = await google_service.get_emails(limit=10)
-            
-            dashboard_data.calendar_events = events
-            dashboard_data.tasks.extend(google_tasks)
-            dashboard_data.emails = emails
+            dashboard_data.tasks.extend(await google_service.get_tasks(limit=10))
         except Exception as e:
-            print(f"Error fetching Google data: {e}")
+            print(f"Error fetching Google tasks data: {e}")
+        try:
+            dashboard_data.emails = await google_service.get_emails(limit=10)
+        except Exception as e:
+            print(f"Error fetching Google email data: {e}")
     
     # Jira data
     if 'jira' in integration_map:
-        jira_service = JiraService(
-            integration_map['jira'].access_token,
-            settings.jira_server
-        )
         try:
-            tickets = await jira_service.get_assigned_tickets(limit=10)
-            dashboard_data.tickets = tickets
+            dashboard_data.tickets, _ = await _read_jira_mirror(db, integration_map['jira'], 10)
         except Exception as e:
             print(f"Error fetching Jira data: {e}")
     
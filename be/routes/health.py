@@ -2,6 +2,12 @@
 Health check routes for monitoring the API status.
 """
 from fastapi import APIRouter
+from typing import Optional
+
+from services.http_client import http_clients
+from services.circuit_breaker import circuit_breakers
+from services.cache_service import cache_service
+from services.cache_stats import cache_stats
 
 router = APIRouter(
     tags=["health"]
@@ -11,3 +17,21 @@ router = APIRouter(
 async def health_check():
     """Simple health check endpoint to verify the API is running."""
     return {"status": "ok"}
+
+@router.get("/health/http")
+async def http_pool_health(host: Optional[str] = None):
+    """Outbound HTTP connection pool metrics per upstream host."""
+    return http_clients.get_metrics(host)
+
+@router.get("/health/circuits")
+async def circuit_breaker_health():
+    """State of the circuit breaker guarding each upstream provider."""
+    return circuit_breakers.get_metrics()
+
+@router.get("/health/cache")
+async def cache_health(service: Optional[str] = None):
+    """Cache backend status and this worker's statistics per service:endpoint namespace."""
+    return {
+        "backend": await cache_service.get_cache_info(),
+        "namespaces": cache_stats.get_metrics(service)
+    }
@@ -2,16 +2,19 @@
 Integration routes for connecting external services.
 """
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
+from datetime import datetime, timezone
 import json
 
-from models.database import get_db, User as DBUser, Integration
+from models.database import get_async_db, User as DBUser, Integration
 from schemas.models import Integration as IntegrationSchema
 from utils.auth import get_current_active_user
 from services.github_service import GitHubService
 from services.google_service import GoogleService
 from services.jira_service import JiraService
+from services.cache_service import cache_service
 from config.settings import settings
 
 router = APIRouter(
@@ -63,12 +66,12 @@ async def get_available_integrations():
 @router.get("/integrations", response_model=List[IntegrationSchema])
 async def get_user_integrations(
     current_user: DBUser = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all integrations for the current user."""
-    integrations = db.query(Integration).filter(
+    integrations = (await db.scalars(select(Integration).where(
         Integration.user_id == current_user.id
-    ).all()
+    ))).all()
     return integrations
 
 # GitHub Integration
@@ -84,7 +87,7 @@ async def github_connect(
 @router.get("/integrations/github/callback")
 async def github_callback(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Handle GitHub OAuth callback."""
     # Get code from query parameters
@@ -119,10 +122,10 @@ async def github_callback(
         raise HTTPException(status_code=400, detail="Failed to get user info")
     
     # Check if integration already exists
-    integration = db.query(Integration).filter(
+    integration = await db.scalar(select(Integration).where(
         Integration.user_id == user_id,
         Integration.service_name == "github"
-    ).first()
+    ))
     
     if integration:
         # Update existing integration
@@ -140,7 +143,9 @@ async def github_callback(
         )
         db.add(integration)
     
-    db.commit()
+    await db.commit()
+    # Drop anything cached under the previous connection
+    await cache_service.invalidate_service(user_id, "github")
     
     # Redirect to frontend
     return {"success": True, "integration": "github", "username": user_info.get("login")}
@@ -158,7 +163,7 @@ async def google_connect(
 @router.get("/integrations/google/callback")
 async def google_callback(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Handle Google OAuth callback."""
     # Get code from query parameters
@@ -185,6 +190,10 @@ async def google_callback(
     
     access_token = token_info["access_token"]
     refresh_token = token_info.get("refresh_token", "")
+    token_expires_at = None
+    if token_info.get("expires_at"):
+        # google-auth reports expiry as naive UTC
+        token_expires_at = datetime.fromisoformat(token_info["expires_at"]).replace(tzinfo=timezone.utc)
     
     # Get user info to verify connection
     try:
@@ -198,15 +207,16 @@ async def google_callback(
         raise HTTPException(status_code=400, detail=f"Error getting user info: {str(e)}")
     
     # Check if integration already exists
-    integration = db.query(Integration).filter(
+    integration = await db.scalar(select(Integration).where(
         Integration.user_id == user_id,
         Integration.service_name == "google"
-    ).first()
+    ))
     
     if integration:
         # Update existing integration
         integration.access_token = access_token
         integration.refresh_token = refresh_token
+        integration.token_expires_at = token_expires_at
         integration.is_active = True
         integration.metadata = json.dumps(user_info)
     else:
@@ -216,12 +226,14 @@ async def google_callback(
             service_name="google",
             access_token=access_token,
             refresh_token=refresh_token,
+            token_expires_at=token_expires_at,
             is_active=True,
             metadata=json.dumps(user_info)
         )
         db.add(integration)
     
-    db.commit()
+    await db.commit()
+    await cache_service.invalidate_service(user_id, "google")
     
     # Redirect to frontend
     return {"success": True, "integration": "google", "email": user_info.get("email")}
@@ -242,7 +254,7 @@ async def jira_connect(
 @router.get("/integrations/jira/callback")
 async def jira_callback(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Handle Jira OAuth callback."""
     code = request.query_params.get("code")
@@ -263,23 +275,34 @@ async def jira_callback(
             raise HTTPException(status_code=400, detail="Failed to get access token")
         
         # Store integration
-        integration = db.query(Integration).filter(
+        integration = await db.scalar(select(Integration).where(
             Integration.user_id == user_id,
             Integration.service_name == "jira"
-        ).first()
+        ))
+        
+        # Cache the site and account so ticket fetches only need the search call
+        user_info = token_data.get("user_info", {})
+        site_config = json.dumps({
+            "cloud_id": user_info.get("cloud_id"),
+            "site_url": user_info.get("site_url"),
+            "account_id": user_info.get("id") if user_info.get("cloud_id") else None
+        })
         
         if integration:
             integration.access_token = token_data["access_token"]
+            integration.config = site_config
             integration.is_active = True
         else:
             integration = Integration(
                 user_id=user_id,
                 service_name="jira",
-                access_token=token_data["access_token"]
+                access_token=token_data["access_token"],
+                config=site_config
             )
             db.add(integration)
         
-        db.commit()
+        await db.commit()
+        await cache_service.invalidate_service(user_id, "jira")
         return {"message": "Jira integration successful"}
         
     except Exception as e:
@@ -289,15 +312,15 @@ async def jira_callback(
 @router.get("/integrations/notes/connect")
 async def notes_connect(
     current_user: DBUser = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Connect to Notes (internal service - no OAuth needed)."""
     try:
         # Check if Notes integration already exists
-        integration = db.query(Integration).filter(
+        integration = await db.scalar(select(Integration).where(
             Integration.user_id == current_user.id,
             Integration.service_name == "notes"
-        ).first()
+        ))
         
         if integration:
             integration.is_active = True
@@ -312,7 +335,8 @@ async def notes_connect(
             )
             db.add(integration)
         
-        db.commit()
+        await db.commit()
+        await cache_service.invalidate_service(current_user.id, "notes")
         return {"success": True, "integration": "notes", "message": "Notes integration activated successfully"}
         
     except Exception as e:
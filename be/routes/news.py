@@ -29,7 +29,7 @@ async def fetch_news_by_company(
     Returns:
         List of NewsBase objects with news articles
     """
-    return get_news_by_company(company_name, days, limit)
+    return await get_news_by_company(company_name, days, limit)
 
 @router.get("/domain/{domain}", response_model=Dict[str, List[NewsBase]])
 async def fetch_news_by_domain(
@@ -48,7 +48,7 @@ async def fetch_news_by_domain(
     Returns:
         Dictionary mapping company names to lists of NewsBase objects
     """
-    return get_news_by_domain(domain, days, limit)
+    return await get_news_by_domain(domain, days, limit)
 
 @router.get("/domains", response_model=List[str])
 async def list_available_domains():
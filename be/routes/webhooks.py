@@ -0,0 +1,118 @@
+"""
+Webhook receivers that keep cached provider data fresh.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import JSON, cast, func, or_, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Optional, Set, Tuple
+from urllib.parse import urlparse
+import hashlib
+import hmac
+import json
+
+from models.database import get_async_db, Integration
+from models.jira import JiraTicket
+from services.cache_service import cache_service
+from services.jira_sync_service import JiraSyncService
+from config.settings import settings
+
+router = APIRouter(
+    prefix="/webhooks",
+    tags=["webhooks"]
+)
+
+JIRA_ISSUE_EVENTS = {"jira:issue_created", "jira:issue_updated", "jira:issue_deleted"}
+
+def _verify_jira_signature(body: bytes, signature: str) -> bool:
+    """Check the X-Hub-Signature HMAC Jira sends for webhooks with a secret."""
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(settings.jira_webhook_secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature[len("sha256="):], expected)
+
+def _affected_account_ids(payload: dict) -> Set[str]:
+    """Collect assignee, reporter and previous-assignee accountIds from an issue event."""
+    fields = (payload.get("issue") or {}).get("fields") or {}
+    account_ids = {
+        (fields.get("assignee") or {}).get("accountId"),
+        (fields.get("reporter") or {}).get("accountId")
+    }
+    # A reassignment also affects whoever the issue was taken from
+    for item in (payload.get("changelog") or {}).get("items", []):
+        if item.get("field") == "assignee" or item.get("fieldId") == "assignee":
+            account_ids.update({item.get("from"), item.get("to")})
+    account_ids.discard(None)
+    return account_ids
+
+def _issue_site(issue: dict) -> Tuple[Optional[str], Optional[str]]:
+    """Site URL or cloud id of the Jira site an issue belongs to, from its self link."""
+    link = urlparse(issue.get("self") or "")
+    if not link.netloc:
+        return None, None
+    if link.netloc == "api.atlassian.com":
+        # OAuth apps get links like https://api.atlassian.com/ex/jira/<cloudId>/rest/...
+        parts = link.path.strip("/").split("/")
+        return None, parts[2] if len(parts) > 2 and parts[:2] == ["ex", "jira"] else None
+    return f"{link.scheme}://{link.netloc}".lower(), None
+
+def _config_field(db: AsyncSession, key: str):
+    """SQL expression for a string value in an integration's JSON config."""
+    # SQLite's JSON functions read the text column as-is; a CAST would turn it into a number
+    convert = type_coerce if db.bind.dialect.name == "sqlite" else cast
+    return convert(Integration.config, JSON)[key].as_string()
+
+@router.post("/jira")
+async def jira_webhook(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Receive Jira issue events, patch ticket mirrors and invalidate cached Jira widgets."""
+    if not settings.jira_webhook_secret:
+        raise HTTPException(status_code=404, detail="Jira webhooks are not configured")
+    
+    body = await request.body()
+    if not _verify_jira_signature(body, request.headers.get("X-Hub-Signature")):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    
+    event = payload.get("webhookEvent")
+    issue = payload.get("issue") or {}
+    if event not in JIRA_ISSUE_EVENTS or not issue.get("id"):
+        return {"status": "ignored", "event": event}
+    
+    # Issue ids and accountIds are only meaningful within the site the event came from
+    site_url, cloud_id = _issue_site(issue)
+    if not site_url and not cloud_id:
+        return {"status": "ignored", "event": event}
+    site_filter = (
+        func.lower(_config_field(db, "site_url")) == site_url if site_url
+        else _config_field(db, "cloud_id") == cloud_id
+    )
+    
+    # Integrations on that site of everyone named on the issue, plus any mirror that holds it
+    mirrored_integration_ids = select(JiraTicket.integration_id).where(JiraTicket.issue_id == str(issue["id"]))
+    integrations = (await db.scalars(select(Integration).where(
+        Integration.service_name == "jira",
+        Integration.is_active == True,
+        Integration.config.isnot(None),
+        site_filter,
+        or_(
+            Integration.id.in_(mirrored_integration_ids),
+            _config_field(db, "account_id").in_(_affected_account_ids(payload))
+        )
+    ))).all()
+    
+    def apply(session: Session, integration: Integration):
+        JiraSyncService(session, integration).apply_issue_event(issue, deleted=event == "jira:issue_deleted")
+    
+    invalidated_users = set()
+    for integration in integrations:
+        # The mirror service works on sync sessions
+        await db.run_sync(apply, integration)
+        if integration.user_id not in invalidated_users:
+            await cache_service.invalidate_service(integration.user_id, "jira")
+            invalidated_users.add(integration.user_id)
+    
+    return {"status": "ok", "event": event, "invalidated_users": len(invalidated_users)}
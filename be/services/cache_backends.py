@@ -0,0 +1,207 @@
+"""
+Storage backends behind the async cache service.
+
+RedisBackend is the shared store used in normal operation. MemoryBackend is a
+bounded, process-local stand-in used while Redis is unreachable: its entries
+are not shared between workers and are dropped when Redis comes back, but
+requests keep being served from cache instead of all going upstream.
+"""
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from config.settings import settings
+from services.local_cache import LocalCache
+
+class CacheBackend(ABC):
+    """Storage operations the cache service is built on."""
+    
+    name = "base"
+    
+    @abstractmethod
+    async def ping(self):
+        """Raise if the store is unreachable."""
+    
+    @abstractmethod
+    async def get_many(self, keys: List[str], with_ttl: bool = False) -> List[Tuple[Optional[bytes], Optional[float]]]:
+        """Get (payload, remaining TTL in seconds) per key; the TTL is only looked up with_ttl."""
+    
+    @abstractmethod
+    async def set_many(self, entries: List[Tuple[str, bytes, int]], tags: List[Tuple[str, str]] = None, delete: List[str] = None):
+        """Store (key, payload, ttl) entries, add (tag, key) pairs and delete keys in one round trip."""
+    
+    @abstractmethod
+    async def acquire_locks(self, keys: List[str], ttl: int) -> List[bool]:
+        """Set each key only if it is absent; returns which ones this caller got."""
+    
+    @abstractmethod
+    async def tag_members(self, tag: str) -> List[str]:
+        """Keys added to a tag."""
+    
+    @abstractmethod
+    async def delete(self, keys: List[str], untag: List[str] = None):
+        """Delete keys (entries or tags) and remove them from the given tags."""
+    
+    @abstractmethod
+    async def get_counters(self, keys: List[str]) -> List[int]:
+        """Read counters, 0 for missing ones."""
+    
+    @abstractmethod
+    async def incr(self, key: str):
+        """Increment a counter that never expires."""
+    
+    @abstractmethod
+    async def publish(self, channel: str, message: str):
+        """Send a message to every worker sharing this store."""
+    
+    @abstractmethod
+    async def info(self) -> dict:
+        """Store statistics."""
+    
+    @abstractmethod
+    async def close(self):
+        """Release connections or memory."""
+
+class RedisBackend(CacheBackend):
+    """Redis store shared by every worker."""
+    
+    name = "redis"
+    
+    def __init__(self, connection_kwargs: dict):
+        self.pool = aioredis.ConnectionPool(**connection_kwargs)
+        self.client = aioredis.Redis(connection_pool=self.pool)
+    
+    async def ping(self):
+        await self.client.ping()
+    
+    async def get_many(self, keys: List[str], with_ttl: bool = False) -> List[Tuple[Optional[bytes], Optional[float]]]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.mget(keys)
+            if with_ttl:
+                for key in keys:
+                    pipe.pttl(key)
+            payloads, *ttls = await pipe.execute()
+        if not with_ttl:
+            return [(payload, None) for payload in payloads]
+        return [(payload, ttl / 1000 if ttl > 0 else None) for payload, ttl in zip(payloads, ttls)]
+    
+    async def set_many(self, entries: List[Tuple[str, bytes, int]], tags: List[Tuple[str, str]] = None, delete: List[str] = None):
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, payload, ttl in entries:
+                pipe.setex(key, ttl, payload)
+            for tag, key in tags or []:
+                pipe.sadd(tag, key)
+                # Tags outlive their members; stale members are harmless on delete
+                pipe.expire(tag, settings.cache_tag_ttl)
+            if delete:
+                pipe.delete(*delete)
+            await pipe.execute()
+    
+    async def acquire_locks(self, keys: List[str], ttl: int) -> List[bool]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.set(key, 1, nx=True, ex=ttl)
+            return [bool(acquired) for acquired in await pipe.execute()]
+    
+    async def tag_members(self, tag: str) -> List[str]:
+        return [key.decode() for key in await self.client.smembers(tag)]
+    
+    async def delete(self, keys: List[str], untag: List[str] = None):
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+            for tag in untag or []:
+                pipe.srem(tag, *keys)
+            await pipe.execute()
+    
+    async def get_counters(self, keys: List[str]) -> List[int]:
+        return [int(value or 0) for value in await self.client.mget(keys)]
+    
+    async def incr(self, key: str):
+        async with self.client.pipeline(transaction=False) as pipe:
+            # Counters written with a TTL by older versions become permanent on their next bump
+            pipe.incr(key).persist(key)
+            await pipe.execute()
+    
+    async def publish(self, channel: str, message: str):
+        await self.client.publish(channel, message)
+    
+    async def info(self) -> dict:
+        info = await self.client.info('stats')
+        return {
+            "total_connections": info.get('total_connections_received', 0),
+            "keyspace_hits": info.get('keyspace_hits', 0),
+            "keyspace_misses": info.get('keyspace_misses', 0),
+            "used_memory": info.get('used_memory_human', 'N/A')
+        }
+    
+    async def close(self):
+        await self.client.aclose()
+        await self.pool.disconnect()
+
+class MemoryBackend(CacheBackend):
+    """Process-local store bounded by payload size, used while Redis is unreachable."""
+    
+    name = "memory"
+    
+    def __init__(self, max_bytes: int):
+        # Entries are (payload, monotonic expiry, tags); TTLs are enforced by LocalCache
+        self.entries = LocalCache(max_bytes, float("inf"))
+        # Two generation counters per user and service; they live as long as the fallback
+        self.counters: Dict[str, int] = {}
+    
+    async def ping(self):
+        pass
+    
+    async def get_many(self, keys: List[str], with_ttl: bool = False) -> List[Tuple[Optional[bytes], Optional[float]]]:
+        now = time.monotonic()
+        results = []
+        for key in keys:
+            entry = self.entries.get(key)
+            results.append((entry[0], entry[1] - now) if entry is not None else (None, None))
+        return results
+    
+    async def set_many(self, entries: List[Tuple[str, bytes, int]], tags: List[Tuple[str, str]] = None, delete: List[str] = None):
+        key_tags: Dict[str, List[str]] = {}
+        for tag, key in tags or []:
+            key_tags.setdefault(key, []).append(tag)
+        for key, payload, ttl in entries:
+            self.entries.set(key, (payload, time.monotonic() + ttl, tuple(key_tags.get(key, ()))), len(payload), ttl)
+        for key in delete or []:
+            self.entries.delete(key)
+    
+    async def acquire_locks(self, keys: List[str], ttl: int) -> List[bool]:
+        acquired = []
+        for key in keys:
+            free = self.entries.get(key) is None
+            if free:
+                self.entries.set(key, (b"1", time.monotonic() + ttl, ()), 1, ttl)
+            acquired.append(free)
+        return acquired
+    
+    async def tag_members(self, tag: str) -> List[str]:
+        # Tags are kept on the entries themselves, so evicted keys never linger in a set
+        return [key for key, (_, _, tags) in self.entries.items() if tag in tags]
+    
+    async def delete(self, keys: List[str], untag: List[str] = None):
+        for key in keys:
+            self.entries.delete(key)
+            self.counters.pop(key, None)
+    
+    async def get_counters(self, keys: List[str]) -> List[int]:
+        return [self.counters.get(key, 0) for key in keys]
+    
+    async def incr(self, key: str):
+        self.counters[key] = self.counters.get(key, 0) + 1
+    
+    async def publish(self, channel: str, message: str):
+        # Nothing else shares this store
+        pass
+    
+    async def info(self) -> dict:
+        return {"entries": len(self.entries), "used_memory": self.entries.size}
+    
+    async def close(self):
+        self.entries.clear()
+        self.counters.clear()
@@ -0,0 +1,109 @@
+"""
+Binary encoding of cached payloads.
+
+Every payload starts with one header byte: the high bit marks the new format,
+bits 3-6 hold the serializer and bits 0-2 the compression. JSON text never
+starts with a byte >= 0x80, so entries written before the codec existed are
+still decoded as plain JSON.
+"""
+import json
+import zlib
+from typing import Any, Tuple
+from config.settings import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+HEADER_FLAG = 0x80
+
+SERIALIZER_JSON = 1
+SERIALIZER_MSGPACK = 2
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize to JSON, using orjson when installed."""
+    if orjson is not None:
+        # Passing datetimes through to default=str keeps the output identical to json.dumps
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(data, default=str).encode()
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON, using orjson when installed."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+class CacheCodec:
+    """Serializes cache values and compresses the ones above a size threshold."""
+    
+    def __init__(self, serializer: str = None, compression: str = None, compression_min_bytes: int = None):
+        serializer = serializer or settings.cache_serializer
+        compression = compression or settings.cache_compression
+        self.serializer = SERIALIZER_MSGPACK if serializer == "msgpack" and msgpack is not None else SERIALIZER_JSON
+        if compression == "zstd" and zstandard is not None:
+            self.compression = COMPRESSION_ZSTD
+        elif compression in ("zstd", "zlib"):
+            self.compression = COMPRESSION_ZLIB
+        else:
+            self.compression = COMPRESSION_NONE
+        self.compression_min_bytes = compression_min_bytes if compression_min_bytes is not None else settings.cache_compression_min_bytes
+        self._zstd_compressor = zstandard.ZstdCompressor(level=3) if zstandard is not None else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+    
+    def encode(self, data: Any) -> Tuple[bytes, int]:
+        """Encode a value. Returns the payload and its uncompressed size."""
+        if self.serializer == SERIALIZER_MSGPACK:
+            raw = msgpack.packb(data, default=str)
+        else:
+            raw = _json_dumps(data)
+        
+        compression = self.compression if len(raw) >= self.compression_min_bytes else COMPRESSION_NONE
+        if compression == COMPRESSION_ZSTD:
+            body = self._zstd_compressor.compress(raw)
+        elif compression == COMPRESSION_ZLIB:
+            body = zlib.compress(raw)
+        else:
+            body = raw
+        
+        header = HEADER_FLAG | (self.serializer << 3) | compression
+        return bytes([header]) + body, len(raw)
+    
+    def decode(self, payload: bytes) -> Tuple[Any, int]:
+        """Decode a payload. Returns the value and its uncompressed size."""
+        header = payload[0]
+        if not header & HEADER_FLAG:
+            # Legacy entry stored as plain JSON text
+            return json.loads(payload), len(payload)
+        
+        serializer = (header >> 3) & 0x0F
+        compression = header & 0x07
+        body = payload[1:]
+        if compression == COMPRESSION_ZSTD:
+            if self._zstd_decompressor is None:
+                raise ValueError("zstd-compressed cache entry but zstandard is not installed")
+            raw = self._zstd_decompressor.decompress(body)
+        elif compression == COMPRESSION_ZLIB:
+            raw = zlib.decompress(body)
+        else:
+            raw = body
+        
+        if serializer == SERIALIZER_MSGPACK:
+            if msgpack is None:
+                raise ValueError("msgpack cache entry but msgpack is not installed")
+            return msgpack.unpackb(raw, strict_map_key=False), len(raw)
+        if serializer == SERIALIZER_JSON:
+            return _json_loads(raw), len(raw)
+        raise ValueError(f"Unknown cache serializer: {serializer}")
@@ -1,68 +1,570 @@
 """
 Redis cache service for caching external API responses.
+
+``cache_service`` is the async client used by the API. ``sync_cache_service``
+is a blocking facade over the same keys for Celery tasks and scripts.
+
+Keys end with the user's and the service's generation numbers. Bumping either
+with a single INCR makes every older entry unreachable; those entries then age
+out through their TTL. The counters themselves never expire, so a generation
+number is never handed out twice.
+
+Values are stored through CacheCodec (JSON or msgpack, compressed above a size
+threshold), so the clients work on raw bytes.
+
+Every cached key is also added to per-user and per-user-service tag sets, so
+invalidation only touches that user's entries instead of scanning the keyspace
+with KEYS.
+
+Values are wrapped with the time it took to compute them and their expiry, and
+reads refresh an entry early with a probability that rises as expiry nears
+(XFetch). Only the request holding a short NX lock recomputes; everyone else
+keeps getting the cached value, so a hot key's expiry never becomes a miss storm.
+
+Each API worker also keeps hot entries in an in-process LRU (L1) in front of
+Redis. Writes and deletes are broadcast on a Redis pub/sub channel so other
+workers drop their L1 copies.
+
+The async service talks to its store through a CacheBackend. When Redis is
+unreachable it falls back to a bounded in-memory backend and moves back to
+Redis once a periodic ping succeeds, replaying the invalidations it made in
+the meantime.
 """
 import redis
+import asyncio
 import json
 import hashlib
-from typing import Any, Optional
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Optional, Set, Tuple
 from config.settings import settings
+from services.local_cache import LocalCache
+from services.cache_codec import CacheCodec
+from services.cache_backends import CacheBackend, MemoryBackend, RedisBackend
+from services.cache_stats import cache_stats
 
-class CacheService:
-    """Redis-based cache service for API responses."""
-    
-    def __init__(self):
-        """Initialize Redis connection."""
-        try:
-            self.redis_client = redis.Redis(
-                host=getattr(settings, 'redis_host', 'localhost'),
-                port=getattr(settings, 'redis_port', 6379),
-                db=getattr(settings, 'redis_db', 0),
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5
-            )
-            # Test connection
-            self.redis_client.ping()
-            self.enabled = True
-        except Exception as e:
-            print(f"Redis connection failed: {e}")
-            print("Cache disabled - continuing without Redis")
-            self.enabled = False
+# Marks values stored with XFetch metadata
+XFETCH_MARKER = "__xfetch__"
+# Cache misses remembered while waiting for the caller to set() the recomputed value
+MAX_PENDING_MISSES = 10000
+
+def _connection_kwargs() -> dict:
+    """Connection settings shared by the async and sync pools."""
+    return {
+        "host": getattr(settings, 'redis_host', 'localhost'),
+        "port": getattr(settings, 'redis_port', 6379),
+        "db": getattr(settings, 'redis_db', 0),
+        "decode_responses": False,  # payloads are binary, see CacheCodec
+        "socket_connect_timeout": 5,
+        "socket_timeout": 5,
+        "max_connections": settings.redis_max_connections
+    }
+
+class BaseCacheService:
+    """Key layout shared by the async and sync cache services."""
     
-    def _generate_key(self, prefix: str, user_id: int, service: str, endpoint: str, params: dict = None) -> str:
+    def _generate_key(self, prefix: str, user_id: int, service: str, endpoint: str, params: dict = None, generations: List[int] = None) -> str:
         """Generate a unique cache key."""
         key_data = f"{prefix}:{user_id}:{service}:{endpoint}"
         if params:
             # Sort params for consistent hashing
             param_str = json.dumps(params, sort_keys=True)
             key_data += f":{hashlib.md5(param_str.encode()).hexdigest()}"
+        if generations is not None:
+            key_data += ":v" + ".".join(str(generation) for generation in generations)
         return key_data
     
+    def _wrap(self, data: Any, compute_time: float, ttl: int) -> dict:
+        """Wrap a value with the metadata used for early recomputation."""
+        return {XFETCH_MARKER: 1, "value": data, "delta": compute_time, "expiry": time.time() + ttl}
+    
+    def _unwrap(self, entry: Any) -> Tuple[Any, float, Optional[float]]:
+        """Split a stored entry into (value, compute time, expiry); older entries carry no metadata."""
+        if isinstance(entry, dict) and XFETCH_MARKER in entry:
+            return entry["value"], entry["delta"], entry["expiry"]
+        return entry, 0.0, None
+    
+    def _generation_keys(self, user_id: int, service: str) -> List[str]:
+        """Counters whose values are embedded in every key of a user's service."""
+        return [f"gen:{user_id}", f"gen:{user_id}:{service}"]
+    
+    def _versioned_pattern(self, user_id: int, service: str, pattern: str) -> str:
+        """Glob matching keys for an endpoint pattern at any generation."""
+        return self._generate_key("api", user_id, service, pattern) + ":v*"
+    
+    def _user_tag(self, user_id: int) -> str:
+        """Set of every cache key stored for a user."""
+        return f"tag:{user_id}"
+    
+    def _service_tag(self, user_id: int, service: str) -> str:
+        """Set of the cache keys stored for one of a user's services."""
+        return f"tag:{user_id}:{service}"
+    
+    def _tags(self, user_id: int, service: str, key: str) -> List[Tuple[str, str]]:
+        """(tag, key) pairs recording a key in its user's and service's tag sets."""
+        return [(self._user_tag(user_id), key), (self._service_tag(user_id, service), key)]
+    
+    def _tag_key(self, pipe, user_id: int, service: str, key: str):
+        """Queue adding a key to its tag sets on a pipeline."""
+        for tag, _ in self._tags(user_id, service, key):
+            pipe.sadd(tag, key)
+            # Tag sets outlive their members; stale members are harmless on delete
+            pipe.expire(tag, settings.cache_tag_ttl)
+    
+    def _invalidation_message(self, keys: List[str] = None, patterns: List[str] = None) -> str:
+        """Build the pub/sub message telling other workers which L1 entries to drop."""
+        return json.dumps({"origin": self.instance_id, "keys": keys or [], "patterns": patterns or []})
+
+class CacheService(BaseCacheService):
+    """Async cache service for API responses, backed by Redis or in-memory while Redis is down."""
+    
+    def __init__(self):
+        """Set up the connection pool; the connection is opened by connect()."""
+        self.redis = RedisBackend(_connection_kwargs())
+        self.backend: CacheBackend = self.redis
+        self.enabled = False
+        self._connect_attempted = False
+        self.instance_id = uuid.uuid4().hex
+        self.codec = CacheCodec()
+        self._pending_misses: "OrderedDict[str, float]" = OrderedDict()
+        # Generation counters bumped while Redis was away, replayed when it returns
+        self._missed_invalidations: Set[str] = set()
+        self.local = LocalCache(settings.cache_l1_max_bytes, settings.cache_l1_max_ttl) if settings.cache_l1_enabled else None
+    
+    async def connect(self) -> bool:
+        """Check the Redis connection; called on application startup."""
+        self._connect_attempted = True
+        try:
+            await self.redis.ping()
+            self._use(self.redis)
+        except Exception as e:
+            print(f"Redis connection failed: {e}")
+            self._fall_back()
+        return self.enabled
+    
+    async def close(self):
+        """Close pooled connections; called on application shutdown."""
+        if self.backend is not self.redis:
+            await self.backend.close()
+        await self.redis.close()
+    
+    def _use(self, backend: CacheBackend):
+        """Switch to a backend."""
+        if backend is not self.backend and self.local is not None:
+            # L1 holds generation numbers read from the previous backend
+            self.local.clear()
+        self.backend = backend
+        self.enabled = True
+    
+    def _fall_back(self):
+        """Move off Redis to the in-memory backend, or disable caching if that is turned off."""
+        if not settings.cache_memory_fallback:
+            print("Cache disabled - continuing without Redis")
+            self.enabled = False
+            return
+        print("Caching in process memory until Redis is back")
+        self._use(MemoryBackend(settings.cache_memory_max_bytes))
+    
+    def _on_redis(self) -> bool:
+        """Whether Redis is currently serving the cache."""
+        return self.enabled and self.backend is self.redis
+    
+    def _handle_error(self, operation: str, error: Exception):
+        """Log a failed cache operation and fall back if Redis went away."""
+        print(f"Cache {operation} error: {error}")
+        if self._on_redis() and isinstance(error, (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError)):
+            self._fall_back()
+    
+    async def run_reconnect_loop(self):
+        """Background loop moving the cache back to Redis once it answers again."""
+        while True:
+            await asyncio.sleep(settings.cache_reconnect_interval)
+            if self._on_redis():
+                continue
+            try:
+                await self.redis.ping()
+                if self._missed_invalidations:
+                    # Entries Redis kept from before the outage may have been invalidated since
+                    for generation_key in list(self._missed_invalidations):
+                        await self.redis.incr(generation_key)
+                        self._missed_invalidations.discard(generation_key)
+            except Exception:
+                continue
+            
+            previous = self.backend
+            self._use(self.redis)
+            if previous is not self.redis:
+                await previous.close()
+            print("Redis connection restored - cache moved back to Redis")
+    
+    async def _ready(self) -> bool:
+        """Whether Redis is usable, connecting on first use outside the app lifespan."""
+        if not self._connect_attempted:
+            await self.connect()
+        return self.enabled
+    
+    async def get(self, user_id: int, service: str, endpoint: str, params: dict = None, early_refresh: bool = True) -> Optional[Any]:
+        """Get cached data. Returns None on a miss, or when this caller should refresh the entry early."""
+        return (await self.get_many(user_id, [(service, endpoint, params)], early_refresh))[0]
+    
+    async def get_many(self, user_id: int, entries: List[Tuple[str, str, Optional[dict]]], early_refresh: bool = True) -> List[Optional[Any]]:
+        """Get cached data for several (service, endpoint, params) entries in one round trip.
+        
+        With early_refresh=False cached values are always returned, for callers
+        that manage staleness inside the value themselves.
+        """
+        results: List[Optional[Any]] = [None] * len(entries)
+        if not entries or not await self._ready():
+            return results
+        
+        started = time.perf_counter()
+        try:
+            keys = await self._versioned_keys(user_id, entries)
+            stored: List[Optional[Any]] = [
+                self.local.get(key) if self.local is not None else None for key in keys
+            ]
+            missing = [index for index, entry in enumerate(stored) if entry is None]
+            if missing:
+                # Fetch the remaining TTLs too when L1 is on, so L1 copies never outlive the stored keys
+                fetched = await self.backend.get_many([keys[index] for index in missing], with_ttl=self.local is not None)
+                for index, (payload, ttl) in zip(missing, fetched):
+                    if not payload:
+                        continue
+                    stored[index], size = self.codec.decode(payload)
+                    if self.local is not None and ttl:
+                        self.local.set(keys[index], stored[index], size, ttl)
+            
+            refresh_candidates = []
+            outcomes = ["hit"] * len(entries)
+            for index, entry in enumerate(stored):
+                if entry is None:
+                    self._record_miss(keys[index])
+                    outcomes[index] = "miss"
+                    continue
+                value, delta, expiry = self._unwrap(entry)
+                results[index] = value
+                if early_refresh and expiry is not None and self._should_refresh_early(delta, expiry):
+                    refresh_candidates.append(index)
+            
+            if refresh_candidates:
+                # Only the caller that wins the lock recomputes; the rest keep the cached value
+                acquired = await self.backend.acquire_locks(
+                    [self._refresh_lock_key(keys[index]) for index in refresh_candidates],
+                    settings.cache_refresh_lock_ttl
+                )
+                for index, won in zip(refresh_candidates, acquired):
+                    if won:
+                        results[index] = None
+                        self._record_miss(keys[index])
+                        outcomes[index] = "early_refresh"
+            
+            # Split the batch round trip across its entries so the histogram counts one sample per key
+            latency = (time.perf_counter() - started) / len(entries)
+            for (service, endpoint, _), outcome in zip(entries, outcomes):
+                cache_stats.record_get(service, endpoint, outcome, latency)
+            return results
+        except Exception as e:
+            self._handle_error("get", e)
+            for service, endpoint, _ in entries:
+                cache_stats.record_error(service, endpoint)
+            return results
+    
+    def _should_refresh_early(self, delta: float, expiry: float) -> bool:
+        """XFetch: refresh ahead of expiry with probability growing as expiry nears and with compute time."""
+        if delta <= 0:
+            return False
+        # 1 - random() is in (0, 1], so the log is defined and never positive
+        return time.time() - delta * settings.cache_xfetch_beta * math.log(1.0 - random.random()) >= expiry
+    
+    def _refresh_lock_key(self, key: str) -> str:
+        """Lock held by the caller recomputing a key ahead of expiry."""
+        return f"lock:{key}"
+    
+    def _record_miss(self, key: str):
+        """Remember when a miss was served so the following set() knows how long recomputing took."""
+        self._pending_misses[key] = time.monotonic()
+        self._pending_misses.move_to_end(key)
+        while len(self._pending_misses) > MAX_PENDING_MISSES:
+            self._pending_misses.popitem(last=False)
+    
+    def _compute_time(self, key: str, compute_time: Optional[float]) -> float:
+        """Compute time of a value being set: explicit, or measured since its miss."""
+        started = self._pending_misses.pop(key, None)
+        if compute_time is not None:
+            return compute_time
+        return time.monotonic() - started if started is not None else 0.0
+    
+    async def set(self, user_id: int, service: str, endpoint: str, data: Any, params: dict = None, ttl: int = 600, compute_time: float = None) -> bool:
+        """Cache data with TTL (default 10 minutes).
+        
+        compute_time defaults to the time since this key's last miss.
+        """
+        if not await self._ready():
+            return False
+        
+        started = time.perf_counter()
+        try:
+            key = await self._versioned_key(user_id, service, endpoint, params)
+            payload, size = self.codec.encode(self._wrap(data, self._compute_time(key, compute_time), ttl))
+            await self.backend.set_many(
+                [(key, payload, ttl)], self._tags(user_id, service, key), delete=[self._refresh_lock_key(key)]
+            )
+            cache_stats.record_set(service, endpoint, len(payload), time.perf_counter() - started)
+            if self.local is not None:
+                # Store what a Redis round trip would return, then evict stale copies elsewhere
+                self.local.set(key, self.codec.decode(payload)[0], size, ttl)
+                await self._publish_invalidation(keys=[key])
+            return True
+        except Exception as e:
+            self._handle_error("set", e)
+            cache_stats.record_error(service, endpoint)
+            return False
+    
+    async def set_many(self, user_id: int, entries: List[Tuple[str, str, Any, Optional[dict], int]], compute_time: float = None) -> bool:
+        """Cache several (service, endpoint, data, params, ttl) entries in one pipeline.
+        
+        compute_time applies to every entry and defaults to the time since each key's last miss.
+        """
+        if not entries or not await self._ready():
+            return False
+        
+        started = time.perf_counter()
+        try:
+            keys = await self._versioned_keys(user_id, [(service, endpoint, params) for service, endpoint, _, params, _ in entries])
+            encoded = [
+                self.codec.encode(self._wrap(data, self._compute_time(key, compute_time), ttl))
+                for key, (_, _, data, _, ttl) in zip(keys, entries)
+            ]
+            await self.backend.set_many(
+                [(key, payload, ttl) for key, (_, _, _, _, ttl), (payload, _) in zip(keys, entries, encoded)],
+                [tag for key, (service, *_) in zip(keys, entries) for tag in self._tags(user_id, service, key)],
+                delete=[self._refresh_lock_key(key) for key in keys]
+            )
+            latency = (time.perf_counter() - started) / len(entries)
+            for (service, endpoint, *_), (payload, _) in zip(entries, encoded):
+                cache_stats.record_set(service, endpoint, len(payload), latency)
+            if self.local is not None:
+                for key, (_, _, _, _, ttl), (payload, size) in zip(keys, entries, encoded):
+                    self.local.set(key, self.codec.decode(payload)[0], size, ttl)
+                await self._publish_invalidation(keys=keys)
+            return True
+        except Exception as e:
+            self._handle_error("set_many", e)
+            for service, endpoint, *_ in entries:
+                cache_stats.record_error(service, endpoint)
+            return False
+    
+    async def delete_pattern(self, user_id: int, service: str, pattern: str = "*"):
+        """Delete cached data matching pattern."""
+        # Redis cannot be cleaned selectively later, so the whole service is invalidated on reconnect
+        self._remember_invalidation(self._generation_keys(user_id, service)[1])
+        if not await self._ready():
+            return
+        
+        try:
+            key_pattern = self._versioned_pattern(user_id, service, pattern)
+            user_tag, service_tag = self._user_tag(user_id), self._service_tag(user_id, service)
+            members = await self.backend.tag_members(service_tag)
+            keys = [key for key in members if fnmatchcase(key, key_pattern)]
+            if keys:
+                await self.backend.delete(keys, untag=[service_tag, user_tag])
+            await self._invalidate_local(patterns=[key_pattern])
+        except Exception as e:
+            self._handle_error("delete", e)
+            self._remember_invalidation(self._generation_keys(user_id, service)[1])
+    
+    async def clear_user_cache(self, user_id: int):
+        """Clear all cached data for a user."""
+        self._remember_invalidation(f"gen:{user_id}")
+        if not await self._ready():
+            return
+        
+        try:
+            key_pattern = f"api:{user_id}:*"
+            user_tag = self._user_tag(user_id)
+            keys = await self.backend.tag_members(user_tag)
+            if keys:
+                # Keys look like api:{user_id}:{service}:..., which names their service tag
+                service_tags = {self._service_tag(user_id, key.split(":")[2]) for key in keys}
+                await self.backend.delete([*keys, *service_tags, user_tag])
+            await self._invalidate_local(patterns=[key_pattern])
+        except Exception as e:
+            self._handle_error("clear", e)
+            self._remember_invalidation(f"gen:{user_id}")
+    
+    async def _versioned_key(self, user_id: int, service: str, endpoint: str, params: dict = None) -> str:
+        """Build the cache key for the current user and service generations."""
+        return (await self._versioned_keys(user_id, [(service, endpoint, params)]))[0]
+    
+    async def _versioned_keys(self, user_id: int, entries: List[Tuple[str, str, Optional[dict]]]) -> List[str]:
+        """Build cache keys for (service, endpoint, params) entries, reading generations in one MGET."""
+        generation_keys = list(dict.fromkeys(
+            key for service, _, _ in entries for key in self._generation_keys(user_id, service)
+        ))
+        generations: Dict[str, Optional[int]] = {
+            key: self.local.get(key) if self.local is not None else None for key in generation_keys
+        }
+        missing = [key for key, generation in generations.items() if generation is None]
+        if missing:
+            for key, value in zip(missing, await self.backend.get_counters(missing)):
+                generations[key] = value
+                if self.local is not None:
+                    self.local.set(key, generations[key], 16)
+        
+        return [
+            self._generate_key("api", user_id, service, endpoint, params, [
+                generations[key] for key in self._generation_keys(user_id, service)
+            ])
+            for service, endpoint, params in entries
+        ]
+    
+    async def invalidate_user(self, user_id: int):
+        """Invalidate every cached entry of a user in O(1) by bumping their generation."""
+        await self._bump_generation(f"gen:{user_id}")
+    
+    async def invalidate_service(self, user_id: int, service: str):
+        """Invalidate every cached entry of one of a user's services in O(1)."""
+        await self._bump_generation(self._generation_keys(user_id, service)[1])
+    
+    async def _bump_generation(self, generation_key: str):
+        """Increment a generation counter and drop its cached value in every worker."""
+        self._remember_invalidation(generation_key)
+        if not await self._ready():
+            return
+        
+        try:
+            await self.backend.incr(generation_key)
+            await self._invalidate_local(keys=[generation_key])
+        except Exception as e:
+            self._handle_error("invalidate", e)
+            self._remember_invalidation(generation_key)
+    
+    def _remember_invalidation(self, generation_key: str):
+        """Queue a generation bump for Redis while it is not serving the cache."""
+        if not self._on_redis():
+            self._missed_invalidations.add(generation_key)
+    
+    async def _invalidate_local(self, keys: List[str] = None, patterns: List[str] = None):
+        """Drop L1 entries here and in every other worker."""
+        if self.local is None:
+            return
+        for key in keys or []:
+            self.local.delete(key)
+        for pattern in patterns or []:
+            self.local.delete_pattern(pattern)
+        await self._publish_invalidation(keys, patterns)
+    
+    async def _publish_invalidation(self, keys: List[str] = None, patterns: List[str] = None):
+        """Tell other workers to drop L1 entries."""
+        await self.backend.publish(
+            settings.cache_invalidation_channel, self._invalidation_message(keys, patterns)
+        )
+    
+    def _apply_invalidation(self, message: str):
+        """Drop the L1 entries named in an invalidation message from another worker."""
+        payload = json.loads(message)
+        if payload.get("origin") == self.instance_id:
+            return
+        for key in payload.get("keys", []):
+            self.local.delete(key)
+        for pattern in payload.get("patterns", []):
+            self.local.delete_pattern(pattern)
+    
+    async def run_invalidation_listener(self):
+        """Background loop applying L1 invalidations published by other workers."""
+        while True:
+            if not self._on_redis():
+                # Nothing to listen to; switching back to Redis clears L1
+                await asyncio.sleep(settings.cache_reconnect_interval)
+                continue
+            pubsub = self.redis.client.pubsub()
+            try:
+                await pubsub.subscribe(settings.cache_invalidation_channel)
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None:
+                        self._apply_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Cache invalidation listener error: {e}")
+                # Invalidations may have been missed while disconnected
+                self.local.clear()
+                await asyncio.sleep(5)
+            finally:
+                await pubsub.aclose()
+    
+    async def get_cache_info(self) -> dict:
+        """Get cache statistics."""
+        if not await self._ready():
+            return {"enabled": False, "status": "Redis not available"}
+        
+        try:
+            return {"enabled": True, "backend": self.backend.name, **await self.backend.info()}
+        except Exception as e:
+            return {"enabled": False, "error": str(e)}
+
+class SyncCacheService(BaseCacheService):
+    """Blocking cache facade for Celery tasks and scripts. Do not use inside async routes."""
+    
+    def __init__(self):
+        """Set up the connection pool; the connection is checked on first use."""
+        self.pool = redis.ConnectionPool(**_connection_kwargs())
+        self.redis_client = redis.Redis(connection_pool=self.pool)
+        self.enabled = False
+        self._last_connect_attempt: Optional[float] = None
+        self.instance_id = uuid.uuid4().hex
+        self.codec = CacheCodec()
+    
+    def _ready(self) -> bool:
+        """Whether Redis is usable, pinging it on first use and again every reconnect interval while down."""
+        if not self.enabled and (
+            self._last_connect_attempt is None
+            or time.monotonic() - self._last_connect_attempt >= settings.cache_reconnect_interval
+        ):
+            self._last_connect_attempt = time.monotonic()
+            try:
+                self.redis_client.ping()
+                self.enabled = True
+            except Exception as e:
+                print(f"Redis connection failed: {e}")
+                print("Cache disabled - continuing without Redis")
+        return self.enabled
+    
     def get(self, user_id: int, service: str, endpoint: str, params: dict = None) -> Optional[Any]:
         """Get cached data."""
-        if not self.enabled:
+        if not self._ready():
             return None
-            
+        
         try:
-            key = self._generate_key("api", user_id, service, endpoint, params)
+            key = self._versioned_key(user_id, service, endpoint, params)
             cached_data = self.redis_client.get(key)
             
             if cached_data:
-                return json.loads(cached_data)
+                # The sync facade never refreshes early; it only strips the metadata
+                return self._unwrap(self.codec.decode(cached_data)[0])[0]
             return None
         except Exception as e:
             print(f"Cache get error: {e}")
             return None
     
-    def set(self, user_id: int, service: str, endpoint: str, data: Any, params: dict = None, ttl: int = 600) -> bool:
+    def set(self, user_id: int, service: str, endpoint: str, data: Any, params: dict = None, ttl: int = 600, compute_time: float = None) -> bool:
         """Cache data with TTL (default 10 minutes)."""
-        if not self.enabled:
+        if not self._ready():
             return False
-            
+        
         try:
-            key = self._generate_key("api", user_id, service, endpoint, params)
-            json_data = json.dumps(data, default=str)  # default=str handles datetime objects
-            self.redis_client.setex(key, ttl, json_data)
+            key = self._versioned_key(user_id, service, endpoint, params)
+            payload, _ = self.codec.encode(self._wrap(data, compute_time or 0.0, ttl))
+            with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.setex(key, ttl, payload)
+                self._tag_key(pipe, user_id, service, key)
+                pipe.execute()
+            self._publish_invalidation(keys=[key])
             return True
         except Exception as e:
             print(f"Cache set error: {e}")
@@ -70,46 +572,66 @@ class CacheService:
     
     def delete_pattern(self, user_id: int, service: str, pattern: str = "*"):
         """Delete cached data matching pattern."""
-        if not self.enabled:
+        if not self._ready():
             return
-            
+        
         try:
-            key_pattern = self._generate_key("api", user_id, service, pattern)
-            keys = self.redis_client.keys(key_pattern)
+            key_pattern = self._versioned_pattern(user_id, service, pattern)
+            user_tag, service_tag = self._user_tag(user_id), self._service_tag(user_id, service)
+            members = [key.decode() for key in self.redis_client.smembers(service_tag)]
+            keys = [key for key in members if fnmatchcase(key, key_pattern)]
             if keys:
-                self.redis_client.delete(*keys)
+                self.redis_client.pipeline(transaction=False).delete(*keys).srem(service_tag, *keys).srem(user_tag, *keys).execute()
+            self._publish_invalidation(patterns=[key_pattern])
         except Exception as e:
             print(f"Cache delete error: {e}")
     
     def clear_user_cache(self, user_id: int):
         """Clear all cached data for a user."""
-        if not self.enabled:
+        if not self._ready():
             return
-            
+        
         try:
             key_pattern = f"api:{user_id}:*"
-            keys = self.redis_client.keys(key_pattern)
+            user_tag = self._user_tag(user_id)
+            keys = [key.decode() for key in self.redis_client.smembers(user_tag)]
             if keys:
-                self.redis_client.delete(*keys)
+                service_tags = {self._service_tag(user_id, key.split(":")[2]) for key in keys}
+                self.redis_client.delete(*keys, *service_tags, user_tag)
+            self._publish_invalidation(patterns=[key_pattern])
         except Exception as e:
             print(f"Cache clear error: {e}")
     
-    def get_cache_info(self) -> dict:
-        """Get cache statistics."""
-        if not self.enabled:
-            return {"enabled": False, "status": "Redis not available"}
-            
+    def _versioned_key(self, user_id: int, service: str, endpoint: str, params: dict = None) -> str:
+        """Build the cache key for the current user and service generations."""
+        generations = [int(value or 0) for value in self.redis_client.mget(self._generation_keys(user_id, service))]
+        return self._generate_key("api", user_id, service, endpoint, params, generations)
+    
+    def invalidate_user(self, user_id: int):
+        """Invalidate every cached entry of a user in O(1) by bumping their generation."""
+        self._bump_generation(f"gen:{user_id}")
+    
+    def invalidate_service(self, user_id: int, service: str):
+        """Invalidate every cached entry of one of a user's services in O(1)."""
+        self._bump_generation(self._generation_keys(user_id, service)[1])
+    
+    def _bump_generation(self, generation_key: str):
+        """Increment a generation counter and drop its cached value in every API worker."""
+        if not self._ready():
+            return
+        
         try:
-            info = self.redis_client.info('stats')
-            return {
-                "enabled": True,
-                "total_connections": info.get('total_connections_received', 0),
-                "keyspace_hits": info.get('keyspace_hits', 0),
-                "keyspace_misses": info.get('keyspace_misses', 0),
-                "used_memory": info.get('used_memory_human', 'N/A')
-            }
+            self.redis_client.pipeline(transaction=False).incr(generation_key).persist(generation_key).execute()
+            self._publish_invalidation(keys=[generation_key])
         except Exception as e:
-            return {"enabled": False, "error": str(e)}
+            print(f"Cache invalidate error: {e}")
+    
+    def _publish_invalidation(self, keys: List[str] = None, patterns: List[str] = None):
+        """Tell API workers to drop L1 entries."""
+        self.redis_client.publish(
+            settings.cache_invalidation_channel, self._invalidation_message(keys, patterns)
+        )
 
-# Global cache instance
+# Global cache instances
 cache_service = CacheService()
+sync_cache_service = SyncCacheService()
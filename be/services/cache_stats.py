@@ -0,0 +1,142 @@
+"""
+In-process cache statistics per (service, endpoint) namespace.
+
+Widget data is cached under its widget type as the endpoint, so each widget
+type gets its own hit ratio, payload sizes and latencies to tune its TTL
+from. Numbers are per worker and start from zero on restart.
+"""
+from bisect import bisect_left
+from typing import Dict, Optional, Sequence, Tuple
+
+# Upper bounds of the histogram buckets; larger values land in a final overflow bucket
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+SIZE_BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum and maximum."""
+    
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of observations."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+    
+    def to_dict(self) -> dict:
+        labels = [f"le_{bound}" for bound in self.bounds] + ["overflow"]
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+class NamespaceStats:
+    """Counters and histograms for one (service, endpoint) namespace."""
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.early_refreshes = 0
+        self.stale_hits = 0
+        self.upstream_errors = 0
+        self.errors = 0
+        self.sets = 0
+        self.payload_bytes = Histogram(SIZE_BUCKETS_BYTES)
+        self.get_latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.set_latency_ms = Histogram(LATENCY_BUCKETS_MS)
+    
+    def to_dict(self) -> dict:
+        lookups = self.hits + self.misses + self.early_refreshes
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "early_refreshes": self.early_refreshes,
+            "stale_hits": self.stale_hits,
+            "upstream_errors": self.upstream_errors,
+            "errors": self.errors,
+            "sets": self.sets,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "payload_bytes": self.payload_bytes.to_dict(),
+            "get_latency_ms": self.get_latency_ms.to_dict(),
+            "set_latency_ms": self.set_latency_ms.to_dict()
+        }
+
+class CacheStats:
+    """Registry of namespace statistics for this worker."""
+    
+    def __init__(self):
+        self._namespaces: Dict[Tuple[str, str], NamespaceStats] = {}
+    
+    def namespace(self, service: str, endpoint: str) -> NamespaceStats:
+        """Get the statistics of a namespace, creating them on first use."""
+        stats = self._namespaces.get((service, endpoint))
+        if stats is None:
+            stats = self._namespaces[(service, endpoint)] = NamespaceStats()
+        return stats
+    
+    def record_get(self, service: str, endpoint: str, outcome: str, latency: float):
+        """Record a lookup whose outcome is "hit", "miss" or "early_refresh"."""
+        stats = self.namespace(service, endpoint)
+        if outcome == "hit":
+            stats.hits += 1
+        elif outcome == "early_refresh":
+            stats.early_refreshes += 1
+        else:
+            stats.misses += 1
+        stats.get_latency_ms.observe(latency * 1000)
+    
+    def record_set(self, service: str, endpoint: str, payload_size: int, latency: float):
+        """Record a write of an encoded payload."""
+        stats = self.namespace(service, endpoint)
+        stats.sets += 1
+        stats.payload_bytes.observe(payload_size)
+        stats.set_latency_ms.observe(latency * 1000)
+    
+    def record_error(self, service: str, endpoint: str):
+        """Record a failed cache operation."""
+        self.namespace(service, endpoint).errors += 1
+    
+    def record_fallback(self, service: str, endpoint: str, stale: bool):
+        """Record a failed upstream fetch answered with stale data or with an error."""
+        stats = self.namespace(service, endpoint)
+        if stale:
+            stats.stale_hits += 1
+        else:
+            stats.upstream_errors += 1
+    
+    def get_metrics(self, service: Optional[str] = None) -> dict:
+        """Statistics keyed by "service:endpoint", optionally for one service."""
+        return {
+            f"{name}:{endpoint}": stats.to_dict()
+            for (name, endpoint), stats in sorted(self._namespaces.items())
+            if service is None or name == service
+        }
+    
+    def reset(self):
+        """Forget every namespace."""
+        self._namespaces.clear()
+
+# Global cache statistics
+cache_stats = CacheStats()
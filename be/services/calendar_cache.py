@@ -0,0 +1,121 @@
+"""
+Interval-aware cache of Google Calendar events.
+
+For each user we remember which time windows have already been fetched and the
+events inside them. A range query only goes to Google for the parts of the range
+that are not covered yet; everything else is answered from the cached windows.
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from schemas.models import CalendarEvent
+from services.cache_service import cache_service
+from services.google_service import GoogleService
+from config.settings import settings
+
+Interval = Tuple[datetime, datetime]
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """Normalize datetimes so naive (assumed UTC) and aware values compare."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def merge_intervals(intervals: List[Tuple[datetime, datetime, datetime]]) -> List[Tuple[datetime, datetime, datetime]]:
+    """Merge overlapping or adjacent (start, end, fetched_at) windows fetched at the same time.
+
+    Windows fetched at different times stay separate so each one expires with
+    its own data; the result is sorted by start.
+    """
+    merged = []
+    for start, end, fetched_at in sorted(intervals):
+        for index in range(len(merged) - 1, -1, -1):
+            last_start, last_end, last_fetched = merged[index]
+            if last_fetched == fetched_at and start <= last_end:
+                merged[index] = (last_start, max(last_end, end), last_fetched)
+                break
+        else:
+            merged.append((start, end, fetched_at))
+    return merged
+
+def uncovered_gaps(start: datetime, end: datetime, covered: List[Tuple[datetime, datetime, datetime]]) -> List[Interval]:
+    """Return the parts of [start, end) not covered by the merged windows."""
+    gaps = []
+    cursor = start
+    for covered_start, covered_end, _ in covered:
+        if covered_end <= cursor:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start))
+        cursor = max(cursor, covered_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+class CalendarRangeCache:
+    """Per-user cache of calendar events indexed by the time windows already fetched."""
+
+    ENDPOINT = "calendar_ranges"
+
+    def __init__(self, ttl: int = None):
+        self.ttl = ttl or settings.calendar_range_cache_ttl
+
+    async def _load(self, user_id: int) -> Tuple[List[Tuple[datetime, datetime, datetime]], Dict[str, dict]]:
+        """Load the live windows and their events for a user."""
+        # Windows expire one by one below; an early refresh would drop every window at once
+        cached = await cache_service.get(user_id, "google", self.ENDPOINT, early_refresh=False)
+        if not cached:
+            return [], {}
+
+        now = datetime.utcnow()
+        windows = []
+        for start, end, fetched_at in cached.get("windows", []):
+            fetched_at = datetime.fromisoformat(fetched_at)
+            # Each window expires on its own so old data is never served past the TTL
+            if (now - fetched_at).total_seconds() < self.ttl:
+                windows.append((datetime.fromisoformat(start), datetime.fromisoformat(end), fetched_at))
+
+        events = {}
+        for event in cached.get("events", []):
+            event_start = _to_naive_utc(datetime.fromisoformat(event["start_time"]))
+            event_end = _to_naive_utc(datetime.fromisoformat(event["end_time"]))
+            if any(event_start < end and event_end > start for start, end, _ in windows):
+                events[event["id"]] = event
+        return windows, events
+
+    async def _save(self, user_id: int, windows: List[Tuple[datetime, datetime, datetime]], events: Dict[str, dict]):
+        """Store merged windows and events for a user."""
+        await cache_service.set(user_id, "google", self.ENDPOINT, {
+            "windows": [[start.isoformat(), end.isoformat(), fetched_at.isoformat()] for start, end, fetched_at in windows],
+            "events": list(events.values())
+        }, ttl=self.ttl)
+
+    async def get_events(self, user_id: int, google_service: GoogleService, start: datetime, end: datetime) -> List[CalendarEvent]:
+        """Get events overlapping [start, end), fetching only the uncovered gaps from Google."""
+        start, end = _to_naive_utc(start), _to_naive_utc(end)
+        windows, events = await self._load(user_id)
+
+        gaps = uncovered_gaps(start, end, windows)
+        if gaps:
+            fetched_at = datetime.utcnow()
+            for gap_start, gap_end in gaps:
+                for event in await google_service.list_calendar_events(gap_start, gap_end, limit=None):
+                    events[event.id] = event.dict()
+                windows.append((gap_start, gap_end, fetched_at))
+            windows = merge_intervals(windows)
+            await self._save(user_id, windows, events)
+
+        matching = []
+        for event in events.values():
+            event = CalendarEvent(**event)
+            if _to_naive_utc(event.start_time) < end and _to_naive_utc(event.end_time) > start:
+                matching.append(event)
+        matching.sort(key=lambda event: _to_naive_utc(event.start_time))
+        return matching
+
+# Global calendar range cache instance
+calendar_range_cache = CalendarRangeCache()
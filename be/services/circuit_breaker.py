@@ -0,0 +1,183 @@
+"""
+Per-provider circuit breakers for upstream API calls.
+
+A breaker watches the outcome and latency of the last calls to a provider. When
+too many of them fail or are slow it opens and calls fail fast with
+CircuitOpenError. After a cool-down it lets a few trial calls through
+(half-open) and closes again if they succeed.
+"""
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from config.settings import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose breaker is open."""
+    
+    def __init__(self, provider: str, retry_at: float):
+        super().__init__(f"{provider} is unavailable (circuit open)")
+        self.provider = provider
+        self.retry_at = retry_at
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over a sliding window of recent calls.
+    
+    Safe to use from worker threads, since Google API calls run in to_thread.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.trial_calls = 0
+        self.times_opened = 0
+        self._calls: Deque[Tuple[bool, bool]] = deque(maxlen=settings.circuit_breaker_window)
+        self._lock = threading.Lock()
+    
+    @property
+    def retry_at(self) -> float:
+        """When an open breaker starts letting trial calls through."""
+        return self.opened_at + settings.circuit_breaker_open_seconds
+    
+    def is_open(self) -> bool:
+        """Whether calls would currently be rejected."""
+        with self._lock:
+            return self.state == OPEN and time.time() < self.retry_at
+    
+    def before_call(self):
+        """Admit a call or raise CircuitOpenError."""
+        with self._lock:
+            if self.state == OPEN:
+                if time.time() < self.retry_at:
+                    raise CircuitOpenError(self.name, self.retry_at)
+                self.state = HALF_OPEN
+                self.trial_calls = 0
+            if self.state == HALF_OPEN:
+                if self.trial_calls >= settings.circuit_breaker_half_open_calls:
+                    raise CircuitOpenError(self.name, time.time() + 1)
+                self.trial_calls += 1
+    
+    def record(self, duration: Optional[float], failed: bool):
+        """Record the outcome of an admitted call and move between states.
+        
+        A duration of None marks a call whose latency says nothing about the
+        provider's health, so it never counts as slow.
+        """
+        slow = duration is not None and duration >= settings.circuit_breaker_slow_call_seconds
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if failed or slow:
+                    self._open()
+                elif self.trial_calls >= settings.circuit_breaker_half_open_calls:
+                    self.state = CLOSED
+                    self._calls.clear()
+                return
+            
+            self._calls.append((failed, slow))
+            if self.state == CLOSED and len(self._calls) >= settings.circuit_breaker_min_calls:
+                failure_rate = sum(failed for failed, _ in self._calls) / len(self._calls)
+                slow_rate = sum(slow for _, slow in self._calls) / len(self._calls)
+                if (failure_rate >= settings.circuit_breaker_failure_rate
+                        or slow_rate >= settings.circuit_breaker_slow_call_rate):
+                    self._open()
+    
+    def _open(self):
+        """Trip the breaker; the lock must be held."""
+        self.state = OPEN
+        self.opened_at = time.time()
+        self.times_opened += 1
+        self._calls.clear()
+        print(f"Circuit breaker for {self.name} opened")
+    
+    def snapshot(self) -> dict:
+        """Current state and window statistics."""
+        with self._lock:
+            calls = len(self._calls)
+            return {
+                "state": self.state,
+                "calls": calls,
+                "failures": sum(failed for failed, _ in self._calls),
+                "slow_calls": sum(slow for _, slow in self._calls),
+                "times_opened": self.times_opened,
+                "retry_at": self.retry_at if self.state != CLOSED else None
+            }
+
+def is_provider_failure(error: Exception) -> bool:
+    """Whether an error says the provider itself is unhealthy, rather than this user's request."""
+    # Imported here to avoid a cycle: provider_backoff depends on the cache service
+    from services.provider_backoff import classify_error
+    return classify_error(error) in ("server_error", "unavailable")
+
+class CircuitBreakerRegistry:
+    """One breaker per provider for the lifetime of the process."""
+    
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, provider: str) -> CircuitBreaker:
+        """Get the breaker for a provider, creating it on first use."""
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(provider)
+            return self._breakers[provider]
+    
+    def is_open(self, provider: str) -> bool:
+        """Whether a provider's breaker is rejecting calls, without creating one."""
+        breaker = self._breakers.get(provider)
+        return breaker is not None and breaker.is_open()
+    
+    def get_metrics(self) -> dict:
+        """Snapshots of every breaker."""
+        return {name: breaker.snapshot() for name, breaker in sorted(self._breakers.items())}
+
+# Global circuit breaker registry
+circuit_breakers = CircuitBreakerRegistry()
+
+def guarded(provider: str, timed: bool = True) -> Callable:
+    """Decorator running a sync or async provider call through its circuit breaker.
+    
+    Use timed=False for calls that make a variable number of requests, whose
+    total duration would otherwise trip the slow-call rule.
+    """
+    def elapsed(started: float) -> Optional[float]:
+        return time.monotonic() - started if timed else None
+    
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                breaker = circuit_breakers.get(provider)
+                breaker.before_call()
+                started = time.monotonic()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    breaker.record(elapsed(started), failed=is_provider_failure(e))
+                    raise
+                breaker.record(elapsed(started), failed=False)
+                return result
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            breaker = circuit_breakers.get(provider)
+            breaker.before_call()
+            started = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                breaker.record(elapsed(started), failed=is_provider_failure(e))
+                raise
+            breaker.record(elapsed(started), failed=False)
+            return result
+        return wrapper
+    return decorator
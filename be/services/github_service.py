@@ -1,8 +1,9 @@
-import httpx
 from github import Github
 from typing import List, Optional
 from datetime import datetime
 from schemas.models import PullRequest
+from services.http_client import http_clients
+from services.circuit_breaker import guarded
 from config.settings import settings
 
 class GitHubService:
@@ -31,19 +32,20 @@ class GitHubService:
     
     async def exchange_code_for_token(self, code: str) -> dict:
         """Exchange authorization code for access token."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://github.com/login/oauth/access_token",
-                data={
-                    "client_id": settings.github_client_id,
-                    "client_secret": settings.github_client_secret,
-                    "code": code,
-                    "redirect_uri": settings.github_redirect_uri,
-                },
-                headers={"Accept": "application/json"}
-            )
-            return response.json()
+        client = http_clients.get("github.com")
+        response = await client.post(
+            "https://github.com/login/oauth/access_token",
+            data={
+                "client_id": settings.github_client_id,
+                "client_secret": settings.github_client_secret,
+                "code": code,
+                "redirect_uri": settings.github_redirect_uri,
+            },
+            headers={"Accept": "application/json"}
+        )
+        return response.json()
     
+    @guarded("github")
     def get_user_info(self) -> dict:
         """Get authenticated user info."""
         if not self.github:
@@ -57,6 +59,8 @@ class GitHubService:
             "avatar_url": user.avatar_url
         }
     
+    # One request per repository scanned, so only failures count towards the breaker
+    @guarded("github", timed=False)
     def get_pull_requests(self, limit: int = 10) -> List[PullRequest]:
         """Get user's pull requests."""
         if not self.github:
@@ -91,47 +95,43 @@ class GitHubService:
         print(f"Total PRs found: {len(prs)}")
         return prs[:limit]
     
+    # The user lookup plus paginated search results
+    @guarded("github", timed=False)
     def get_assigned_issues(self, limit: int = 10) -> List[dict]:
-        """Get issues assigned to the user."""
+        """Get issues assigned to the user, raising on API errors."""
         if not self.github:
             raise ValueError("GitHub client not initialized. Access token required.")
         user = self.github.get_user()
         issues = []
         
-        try:
-            for issue in self.github.search_issues(f"assignee:{user.login} is:issue is:open", sort="updated")[:limit]:
-                issues.append({
-                    "id": issue.id,
-                    "title": issue.title,
-                    "url": issue.html_url,
-                    "state": issue.state,
-                    "created_at": issue.created_at,
-                    "updated_at": issue.updated_at,
-                    "repository": issue.repository.full_name,
-                    "labels": [label.name for label in issue.labels]
-                })
-        except Exception as e:
-            print(f"Error fetching issues: {e}")
+        for issue in self.github.search_issues(f"assignee:{user.login} is:issue is:open", sort="updated")[:limit]:
+            issues.append({
+                "id": issue.id,
+                "title": issue.title,
+                "url": issue.html_url,
+                "state": issue.state,
+                "created_at": issue.created_at,
+                "updated_at": issue.updated_at,
+                "repository": issue.repository.full_name,
+                "labels": [label.name for label in issue.labels]
+            })
         
         return issues
     
+    @guarded("github")
     def get_notifications(self, limit: int = 10) -> List[dict]:
-        """Get user notifications."""
+        """Get user notifications, raising on API errors."""
         if not self.github:
             raise ValueError("GitHub client not initialized. Access token required.")
-        try:
-            notifications = []
-            for notification in self.github.get_user().get_notifications()[:limit]:
-                notifications.append({
-                    "id": notification.id,
-                    "title": notification.subject.title,
-                    "type": notification.subject.type,
-                    "reason": notification.reason,
-                    "updated_at": notification.updated_at,
-                    "repository": notification.repository.full_name if notification.repository else None,
-                    "unread": notification.unread
-                })
-            return notifications
-        except Exception as e:
-            print(f"Error fetching notifications: {e}")
-            return []
+        notifications = []
+        for notification in self.github.get_user().get_notifications()[:limit]:
+            notifications.append({
+                "id": notification.id,
+                "title": notification.subject.title,
+                "type": notification.subject.type,
+                "reason": notification.reason,
+                "updated_at": notification.updated_at,
+                "repository": notification.repository.full_name if notification.repository else None,
+                "unread": notification.unread
+            })
+        return notifications
@@ -1,24 +1,142 @@
-import httpx
+import asyncio
+import contextlib
+import heapq
+import time
 from google.auth.transport.requests import Request as GoogleRequest
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 from google_auth_oauthlib.flow import Flow
-from typing import List, Optional
-from datetime import datetime, timedelta
+from sqlalchemy import or_
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 import warnings
+from models.database import SessionLocal, Integration
 from schemas.models import CalendarEvent, Task, Email
 from config.settings import settings
+from services.circuit_breaker import CircuitOpenError, circuit_breakers, is_provider_failure
+
+# One lock per integration so concurrent requests share a single token refresh
+_refresh_locks: Dict[int, asyncio.Lock] = {}
+# Most recent (token, expiry) obtained per integration in this process
+_latest_tokens: Dict[int, Tuple[str, datetime]] = {}
+
+def _to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert a datetime to the naive UTC form expected by google-auth."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+# Largest page Google Calendar returns for a single events().list call
+CALENDAR_PAGE_SIZE = 2500
+# Pages buffered per calendar while the merge is consuming another calendar
+CALENDAR_PREFETCH_PAGES = 2
+# Google batch endpoints accept a limited number of calls per request
+TASKS_BATCH_SIZE = 50
+# Largest page the Tasks API returns
+TASKS_PAGE_SIZE = 100
+# Partial response: the task fields _parse_task reads
+TASKS_FIELDS = "nextPageToken,items(id,title,notes,due,status)"
+
+def _parse_event(event: dict) -> CalendarEvent:
+    """Convert a Google Calendar API item into a CalendarEvent."""
+    start = event['start'].get('dateTime', event['start'].get('date'))
+    end = event['end'].get('dateTime', event['end'].get('date'))
+    
+    # Parse datetime strings
+    if 'T' in start:
+        start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
+        end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
+    else:
+        # All-day event
+        start_dt = datetime.fromisoformat(start + 'T00:00:00+00:00')
+        end_dt = datetime.fromisoformat(end + 'T23:59:59+00:00')
+    
+    return CalendarEvent(
+        id=event['id'],
+        title=event.get('summary', 'No Title'),
+        start_time=start_dt,
+        end_time=end_dt,
+        description=event.get('description'),
+        location=event.get('location')
+    )
+
+def _parse_task(task: dict) -> Task:
+    """Convert a Google Tasks API item into a Task."""
+    due_date = None
+    if task.get('due'):
+        due_date = datetime.fromisoformat(task['due'].replace('Z', '+00:00'))
+    
+    return Task(
+        id=task['id'],
+        title=task.get('title', 'No Title'),
+        description=task.get('notes'),
+        due_date=due_date,
+        status=task.get('status', 'needsAction'),
+        priority=None  # Google Tasks doesn't have priority
+    )
+
+def _task_sort_key(task: Task) -> tuple:
+    """Open tasks before completed ones, then by due date with undated tasks last."""
+    due_date = task.due_date or datetime.max.replace(tzinfo=timezone.utc)
+    return (task.status == 'completed', task.due_date is None, due_date, task.title)
+
+def _persist_tokens(integration_id: int, access_token: str, expires_at: Optional[datetime]):
+    """Write a refreshed access token and its expiry back to the integration row."""
+    db = SessionLocal()
+    try:
+        integration = db.query(Integration).filter(Integration.id == integration_id).first()
+        if integration:
+            integration.access_token = access_token
+            integration.token_expires_at = expires_at.replace(tzinfo=timezone.utc) if expires_at else None
+            db.commit()
+    finally:
+        db.close()
+
+class _GuardedHttp(AuthorizedHttp):
+    """Authorized httplib2 client whose requests go through the Google circuit breaker."""
+    
+    def request(self, uri, method="GET", *args, **kwargs):
+        breaker = circuit_breakers.get("google")
+        breaker.before_call()
+        started = time.monotonic()
+        try:
+            response, content = super().request(uri, method, *args, **kwargs)
+        except Exception as e:
+            breaker.record(time.monotonic() - started, failed=is_provider_failure(e))
+            raise
+        breaker.record(time.monotonic() - started, failed=response.status >= 500)
+        return response, content
+
+def _build_service(name: str, version: str, credentials: Credentials):
+    """Build a Google API client; httplib2 is not thread-safe, so callers must not share it across threads."""
+    http = _GuardedHttp(credentials, http=httplib2.Http(timeout=settings.http_timeout))
+    return build(name, version, http=http)
 
 class GoogleService:
-    def __init__(self, access_token: str, refresh_token: str = None):
+    def __init__(self, access_token: str, refresh_token: str = None,
+                 token_expires_at: datetime = None, integration_id: int = None):
         self.access_token = access_token
         self.refresh_token = refresh_token
+        self.integration_id = integration_id
         self.credentials = Credentials(
             token=access_token,
             refresh_token=refresh_token,
             token_uri="https://oauth2.googleapis.com/token",
             client_id=settings.google_client_id,
-            client_secret=settings.google_client_secret
+            client_secret=settings.google_client_secret,
+            expiry=_to_naive_utc(token_expires_at)
+        )
+    
+    @classmethod
+    def from_integration(cls, integration: Integration) -> "GoogleService":
+        """Create a service bound to an integration row so refreshed tokens are persisted."""
+        return cls(
+            integration.access_token,
+            integration.refresh_token,
+            token_expires_at=integration.token_expires_at,
+            integration_id=integration.id
         )
     
     async def get_oauth_url(self, state: str = None) -> str:
@@ -105,161 +223,276 @@ class GoogleService:
             print(f"Traceback: {traceback.format_exc()}")
             return {}
     
-    def refresh_credentials(self):
-        """Refresh access token if needed."""
-        if self.credentials.expired and self.credentials.refresh_token:
-            self.credentials.refresh(GoogleRequest())
-            return self.credentials.token
+    def _needs_refresh(self, margin: timedelta = None) -> bool:
+        """Check whether the token is expired, or will be within ``margin``."""
+        if not self.credentials.refresh_token:
+            return False
+        if margin is None:
+            return self.credentials.expired
+        # Tokens without a known expiry are refreshed once so we learn it
+        if self.credentials.expiry is None:
+            return True
+        return datetime.utcnow() + margin >= self.credentials.expiry
+    
+    def _adopt_token(self, token: str, expiry: Optional[datetime]):
+        """Use a token that was already refreshed elsewhere in this process."""
+        self.credentials.token = token
+        self.credentials.expiry = expiry
+        self.access_token = token
+    
+    async def refresh_credentials(self, margin: timedelta = None) -> str:
+        """Refresh access token if needed and persist it to the integration."""
+        if not self._needs_refresh(margin):
+            return self.access_token
+        
+        if self.integration_id is None:
+            await asyncio.to_thread(self.credentials.refresh, GoogleRequest())
+            self.access_token = self.credentials.token
+            return self.access_token
+        
+        lock = _refresh_locks.setdefault(self.integration_id, asyncio.Lock())
+        async with lock:
+            # Another request may have refreshed this integration while we waited
+            latest = _latest_tokens.get(self.integration_id)
+            if latest and (self.credentials.expiry is None or (latest[1] and latest[1] > self.credentials.expiry)):
+                self._adopt_token(*latest)
+                if not self._needs_refresh(margin):
+                    return self.access_token
+            
+            await asyncio.to_thread(self.credentials.refresh, GoogleRequest())
+            self.access_token = self.credentials.token
+            _latest_tokens[self.integration_id] = (self.credentials.token, self.credentials.expiry)
+            await asyncio.to_thread(
+                _persist_tokens, self.integration_id, self.credentials.token, self.credentials.expiry
+            )
         return self.access_token
     
     async def get_calendar_events(self, limit: int = 10, days_ahead: int = 7, start_date: datetime = None, end_date: datetime = None) -> List[CalendarEvent]:
-        """Get calendar events within a date range."""
-        try:
-            self.refresh_credentials()
-            service = build('calendar', 'v3', credentials=self.credentials)
-            
-            # Use provided dates or default to current time + days_ahead
-            if start_date is None:
-                start_time = datetime.utcnow()
-            else:
-                start_time = start_date
-                
-            if end_date is None:
-                end_time = start_time + timedelta(days=days_ahead)
-            else:
-                end_time = end_date
-            
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=start_time.isoformat() + 'Z',
-                timeMax=end_time.isoformat() + 'Z',
-                maxResults=limit,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+        """Get calendar events within a date range, raising on API errors."""
+        # Use provided dates or default to current time + days_ahead
+        if start_date is None:
+            start_time = datetime.utcnow()
+        else:
+            start_time = start_date
             
-            events = events_result.get('items', [])
-            calendar_events = []
+        if end_date is None:
+            end_time = start_time + timedelta(days=days_ahead)
+        else:
+            end_time = end_date
+        
+        return await self.list_calendar_events(start_time, end_time, limit=limit)
+    
+    async def list_calendar_events(self, start_time: datetime, end_time: datetime, limit: Optional[int] = 10) -> List[CalendarEvent]:
+        """Get calendar events between two naive UTC datetimes, raising on API errors.
+
+        ``limit=None`` returns every event in the range.
+        """
+        events = []
+        page_size = min(limit or CALENDAR_PAGE_SIZE, CALENDAR_PAGE_SIZE)
+        # Close the generator on break so its producers are cancelled right away
+        async with contextlib.aclosing(self.iter_calendar_events(start_time, end_time, page_size=page_size)) as stream:
+            async for event in stream:
+                events.append(event)
+                if limit is not None and len(events) >= limit:
+                    break
+        return events
+    
+    async def _list_calendar_ids(self) -> List[str]:
+        """Get the ids of every calendar on the user's calendar list, primary first."""
+        service = _build_service('calendar', 'v3', self.credentials)
+        items = []
+        page_token = None
+        while True:
+            result = await asyncio.to_thread(service.calendarList().list(pageToken=page_token).execute)
+            items.extend(result.get('items', []))
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                break
+        items.sort(key=lambda item: not item.get('primary', False))
+        return [item['id'] for item in items] or ['primary']
+    
+    async def _produce_calendar_pages(self, calendar_id: str, start_time: datetime, end_time: datetime,
+                                      page_size: int, queue: asyncio.Queue):
+        """Follow nextPageToken for one calendar and push parsed pages onto the queue."""
+        try:
+            # httplib2 is not thread-safe, so every calendar gets its own client
+            service = _build_service('calendar', 'v3', self.credentials)
+            page_token = None
+            while True:
+                result = await asyncio.to_thread(service.events().list(
+                    calendarId=calendar_id,
+                    timeMin=start_time.isoformat() + 'Z',
+                    timeMax=end_time.isoformat() + 'Z',
+                    maxResults=page_size,
+                    singleEvents=True,
+                    orderBy='startTime',
+                    pageToken=page_token
+                ).execute)
+                await queue.put([_parse_event(event) for event in result.get('items', [])])
+                page_token = result.get('nextPageToken')
+                if not page_token:
+                    break
+            await queue.put(None)
+        except Exception as e:
+            await queue.put(e)
+    
+    async def iter_calendar_events(self, start_time: datetime, end_time: datetime,
+                                   page_size: int = CALENDAR_PAGE_SIZE) -> AsyncIterator[CalendarEvent]:
+        """Stream events from all of the user's calendars, sorted by start time.
+
+        Every calendar is paged concurrently in the background and the sorted
+        per-calendar streams are combined with a k-way merge, so events are
+        yielded as soon as the earliest remaining one is known.
+        """
+        await self.refresh_credentials()
+        calendar_ids = await self._list_calendar_ids()
+        
+        queues = [asyncio.Queue(maxsize=CALENDAR_PREFETCH_PAGES) for _ in calendar_ids]
+        producers = [
+            asyncio.create_task(self._produce_calendar_pages(calendar_id, start_time, end_time, page_size, queue))
+            for calendar_id, queue in zip(calendar_ids, queues)
+        ]
+        
+        async def calendar_stream(calendar_id: str, queue: asyncio.Queue, required: bool) -> AsyncIterator[CalendarEvent]:
+            while True:
+                page = await queue.get()
+                if page is None:
+                    return
+                if isinstance(page, Exception):
+                    if required or isinstance(page, CircuitOpenError):
+                        raise page
+                    # A secondary calendar (e.g. free/busy only) must not take the others down
+                    print(f"Skipping calendar {calendar_id}: {page}")
+                    return
+                for event in page:
+                    yield event
+        
+        # Only failures of the primary calendar fail the whole stream
+        streams = [
+            calendar_stream(calendar_id, queue, required=index == 0)
+            for index, (calendar_id, queue) in enumerate(zip(calendar_ids, queues))
+        ]
+        try:
+            heap = []
+            for index, stream in enumerate(streams):
+                event = await anext(stream, None)
+                if event is not None:
+                    heapq.heappush(heap, (event.start_time, index, event))
             
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
-                # Parse datetime strings
-                if 'T' in start:
-                    start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                    end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
-                else:
-                    # All-day event
-                    start_dt = datetime.fromisoformat(start + 'T00:00:00+00:00')
-                    end_dt = datetime.fromisoformat(end + 'T23:59:59+00:00')
+            # Shared meetings show up on several calendars under the same id
+            seen_ids = set()
+            while heap:
+                _, index, event = heapq.heappop(heap)
+                if event.id not in seen_ids:
+                    seen_ids.add(event.id)
+                    yield event
                 
-                calendar_events.append(CalendarEvent(
-                    id=event['id'],
-                    title=event.get('summary', 'No Title'),
-                    start_time=start_dt,
-                    end_time=end_dt,
-                    description=event.get('description'),
-                    location=event.get('location')
-                ))
-            
-            return calendar_events
-        except Exception as e:
-            print(f"Error fetching calendar events: {e}")
-            return []
+                next_event = await anext(streams[index], None)
+                if next_event is not None:
+                    heapq.heappush(heap, (next_event.start_time, index, next_event))
+        finally:
+            for producer in producers:
+                producer.cancel()
+            await asyncio.gather(*producers, return_exceptions=True)
     
     async def get_tasks(self, limit: int = 10) -> List[Task]:
-        """Get Google Tasks."""
-        try:
-            self.refresh_credentials()
-            service = build('tasks', 'v1', credentials=self.credentials)
+        """Get Google Tasks from all task lists, open ones soonest due first; raises on API errors."""
+        await self.refresh_credentials()
+        service = _build_service('tasks', 'v1', self.credentials)
+        
+        # Get task lists
+        task_lists = await asyncio.to_thread(service.tasklists().list().execute)
+        all_tasks = []
+        errors = []
+        
+        # Page token per task list still to fetch (None = first page)
+        pending = {task_list['id']: None for task_list in task_lists.get('items', [])}
+        
+        while pending:
+            next_pending = {}
             
-            # Get task lists
-            task_lists = service.tasklists().list().execute()
-            all_tasks = []
+            def collect(request_id, response, exception):
+                if exception is not None:
+                    errors.append(exception)
+                    return
+                all_tasks.extend(_parse_task(task) for task in response.get('items', []))
+                if response.get('nextPageToken'):
+                    next_pending[request_id] = response['nextPageToken']
             
-            for task_list in task_lists.get('items', []):
-                tasks_result = service.tasks().list(
-                    tasklist=task_list['id'],
-                    maxResults=limit
-                ).execute()
-                
-                for task in tasks_result.get('items', []):
-                    due_date = None
-                    if task.get('due'):
-                        due_date = datetime.fromisoformat(task['due'].replace('Z', '+00:00'))
-                    
-                    all_tasks.append(Task(
-                        id=task['id'],
-                        title=task.get('title', 'No Title'),
-                        description=task.get('notes'),
-                        due_date=due_date,
-                        status=task.get('status', 'needsAction'),
-                        priority=None  # Google Tasks doesn't have priority
-                    ))
-                
-                if len(all_tasks) >= limit:
-                    break
+            # Fetch every pending task list in one round trip per batch
+            list_ids = list(pending)
+            for i in range(0, len(list_ids), TASKS_BATCH_SIZE):
+                batch = service.new_batch_http_request(callback=collect)
+                for list_id in list_ids[i:i + TASKS_BATCH_SIZE]:
+                    # Only the fields _parse_task reads are requested
+                    batch.add(
+                        service.tasks().list(
+                            tasklist=list_id,
+                            maxResults=TASKS_PAGE_SIZE,
+                            fields=TASKS_FIELDS,
+                            pageToken=pending[list_id]
+                        ),
+                        request_id=list_id
+                    )
+                await asyncio.to_thread(batch.execute)
+                # Batch calls fail individually; a partial list must not be served as fresh data
+                if errors:
+                    raise errors[0]
             
-            return all_tasks[:limit]
-        except Exception as e:
-            print(f"Error fetching tasks: {e}")
-            return []
+            pending = next_pending
+        
+        return heapq.nsmallest(limit, all_tasks, key=_task_sort_key)
     
     async def get_emails(self, limit: int = 10) -> List[Email]:
-        """Get recent emails from Gmail."""
-        try:
-            self.refresh_credentials()
-            service = build('gmail', 'v1', credentials=self.credentials)
-            
-            # Get recent messages
-            messages_result = service.users().messages().list(
+        """Get recent emails from Gmail, raising on API errors."""
+        await self.refresh_credentials()
+        service = _build_service('gmail', 'v1', self.credentials)
+        
+        # Get recent messages
+        messages_result = service.users().messages().list(
+            userId='me',
+            maxResults=limit,
+            q='is:unread OR is:important'
+        ).execute()
+        
+        messages = messages_result.get('messages', [])
+        emails = []
+        
+        for message in messages:
+            msg = service.users().messages().get(
                 userId='me',
-                maxResults=limit,
-                q='is:unread OR is:important'
+                id=message['id'],
+                format='metadata',
+                metadataHeaders=['From', 'Subject', 'Date']
             ).execute()
             
-            messages = messages_result.get('messages', [])
-            emails = []
+            headers = {h['name']: h['value'] for h in msg.get('payload', {}).get('headers', [])}
             
-            for message in messages:
-                msg = service.users().messages().get(
-                    userId='me',
-                    id=message['id'],
-                    format='metadata',
-                    metadataHeaders=['From', 'Subject', 'Date']
-                ).execute()
-                
-                headers = {h['name']: h['value'] for h in msg.get('payload', {}).get('headers', [])}
-                
-                # Parse date
-                received_at = datetime.now()  # Default to now if parsing fails
-                if 'Date' in headers:
-                    try:
-                        from email.utils import parsedate_to_datetime
-                        received_at = parsedate_to_datetime(headers['Date'])
-                    except:
-                        pass
-                
-                emails.append(Email(
-                    id=message['id'],
-                    subject=headers.get('Subject', 'No Subject'),
-                    sender=headers.get('From', 'Unknown'),
-                    received_at=received_at,
-                    is_read='UNREAD' not in msg.get('labelIds', []),
-                    snippet=msg.get('snippet', '')[:100] + '...' if len(msg.get('snippet', '')) > 100 else msg.get('snippet', '')
-                ))
+            # Parse date
+            received_at = datetime.now()  # Default to now if parsing fails
+            if 'Date' in headers:
+                try:
+                    from email.utils import parsedate_to_datetime
+                    received_at = parsedate_to_datetime(headers['Date'])
+                except:
+                    pass
             
-            return emails
-        except Exception as e:
-            print(f"Error fetching emails: {e}")
-            return []
+            emails.append(Email(
+                id=message['id'],
+                subject=headers.get('Subject', 'No Subject'),
+                sender=headers.get('From', 'Unknown'),
+                received_at=received_at,
+                is_read='UNREAD' not in msg.get('labelIds', []),
+                snippet=msg.get('snippet', '')[:100] + '...' if len(msg.get('snippet', '')) > 100 else msg.get('snippet', '')
+            ))
+        
+        return emails
     
     async def get_user_info(self) -> dict:
         """Get user info."""
         try:
-            self.refresh_credentials()
-            service = build('oauth2', 'v2', credentials=self.credentials)
+            await self.refresh_credentials()
+            service = _build_service('oauth2', 'v2', self.credentials)
             
             user_info = service.userinfo().get().execute()
             return {
@@ -271,3 +504,43 @@ class GoogleService:
         except Exception as e:
             print(f"Error fetching user info: {e}")
             return {}
+
+async def refresh_expiring_tokens(margin_seconds: int = None) -> int:
+    """Refresh Google tokens that expire within the margin. Returns the number refreshed."""
+    margin = timedelta(seconds=margin_seconds or settings.google_token_refresh_margin)
+    cutoff = datetime.now(timezone.utc) + margin
+    
+    def load_integrations() -> List[Integration]:
+        db = SessionLocal()
+        try:
+            return db.query(Integration).filter(
+                Integration.service_name == "google",
+                Integration.is_active == True,
+                Integration.refresh_token != None,
+                Integration.refresh_token != "",
+                or_(Integration.token_expires_at == None, Integration.token_expires_at <= cutoff)
+            ).all()
+        finally:
+            db.close()
+    
+    refreshed = 0
+    for integration in await asyncio.to_thread(load_integrations):
+        try:
+            google_service = GoogleService.from_integration(integration)
+            previous_token = google_service.access_token
+            if await google_service.refresh_credentials(margin=margin) != previous_token:
+                refreshed += 1
+        except Exception as e:
+            print(f"Error refreshing Google token for integration {integration.id}: {e}")
+    return refreshed
+
+async def run_token_refresher():
+    """Background loop that refreshes Google tokens shortly before they expire."""
+    while True:
+        try:
+            refreshed = await refresh_expiring_tokens()
+            if refreshed:
+                print(f"Proactively refreshed {refreshed} Google token(s)")
+        except Exception as e:
+            print(f"Google token refresher error: {e}")
+        await asyncio.sleep(settings.google_token_refresh_interval)
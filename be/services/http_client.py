@@ -0,0 +1,152 @@
+"""
+Shared outbound HTTP clients for upstream providers.
+
+One pooled ``httpx.AsyncClient`` is kept per upstream host for the lifetime of
+the application, so requests reuse keep-alive (and HTTP/2) connections instead
+of paying a new TCP and TLS handshake every time. Requests to known provider
+hosts also go through that provider's circuit breaker.
+"""
+import time
+import httpx
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from config.settings import settings
+from services.circuit_breaker import CircuitBreaker, circuit_breakers, is_provider_failure
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Circuit breaker guarding each upstream host
+PROVIDER_HOSTS = {
+    "api.atlassian.com": "jira",
+    "auth.atlassian.com": "jira",
+    "github.com": "github",
+    "api.github.com": "github",
+    "newsapi.org": "news"
+}
+
+class _PoolMetrics:
+    """Request counters and latency for one upstream host."""
+    
+    def __init__(self):
+        self.requests = 0
+        self.in_flight = 0
+        self.errors = 0
+        self.server_errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.http_versions: Dict[str, int] = {}
+    
+    def to_dict(self) -> dict:
+        completed = self.requests - self.in_flight
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "errors": self.errors,
+            "server_errors": self.server_errors,
+            "avg_latency_ms": round(self.total_latency / completed * 1000, 2) if completed else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 2),
+            "http_versions": dict(self.http_versions)
+        }
+
+class _InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """Connection-pooling transport that records per-host metrics."""
+    
+    def __init__(self, metrics: _PoolMetrics, breaker: Optional[CircuitBreaker] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.metrics = metrics
+        self.breaker = breaker
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.breaker is not None:
+            self.breaker.before_call()
+        self.metrics.requests += 1
+        self.metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception as e:
+            self.metrics.errors += 1
+            if self.breaker is not None:
+                self.breaker.record(time.perf_counter() - start, failed=is_provider_failure(e))
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            self.metrics.in_flight -= 1
+            self.metrics.total_latency += latency
+            self.metrics.max_latency = max(self.metrics.max_latency, latency)
+        
+        if self.breaker is not None:
+            self.breaker.record(latency, failed=response.status_code >= 500)
+        if response.status_code >= 500:
+            self.metrics.server_errors += 1
+        http_version = response.extensions.get("http_version", b"HTTP/1.1").decode()
+        self.metrics.http_versions[http_version] = self.metrics.http_versions.get(http_version, 0) + 1
+        return response
+    
+    @property
+    def open_connections(self) -> int:
+        # httpx does not expose pool statistics publicly
+        pool = getattr(self, "_pool", None)
+        return len(getattr(pool, "connections", []))
+
+class HttpClientRegistry:
+    """Application-lifespan registry of pooled HTTP clients, one per upstream host."""
+    
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, _InstrumentedTransport] = {}
+        self._metrics: Dict[str, _PoolMetrics] = {}
+    
+    def get(self, host: str) -> httpx.AsyncClient:
+        """Get the shared client for an upstream host, creating it on first use."""
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            metrics = self._metrics.setdefault(host, _PoolMetrics())
+            provider = PROVIDER_HOSTS.get(host)
+            transport = _InstrumentedTransport(
+                metrics,
+                breaker=circuit_breakers.get(provider) if provider else None,
+                http2=settings.http2_enabled and HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=settings.http_max_connections,
+                    max_keepalive_connections=settings.http_max_keepalive_connections,
+                    keepalive_expiry=settings.http_keepalive_expiry
+                ),
+                retries=1  # retry connection failures once
+            )
+            client = httpx.AsyncClient(
+                transport=transport,
+                timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout)
+            )
+            self._clients[host] = client
+            self._transports[host] = transport
+        return client
+    
+    def for_url(self, url: str) -> httpx.AsyncClient:
+        """Get the shared client for the host of a URL."""
+        return self.get(urlsplit(url).hostname)
+    
+    async def close(self):
+        """Close every client; called on application shutdown."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        self._transports.clear()
+    
+    def get_metrics(self, host: Optional[str] = None) -> dict:
+        """Get per-host pool metrics."""
+        hosts = [host] if host else sorted(self._metrics)
+        return {
+            name: {
+                **self._metrics[name].to_dict(),
+                "open_connections": self._transports[name].open_connections if name in self._transports else 0
+            }
+            for name in hosts if name in self._metrics
+        }
+
+# Global HTTP client registry
+http_clients = HttpClientRegistry()
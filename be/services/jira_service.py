@@ -1,15 +1,75 @@
+import asyncio
 import httpx
-from jira import JIRA
-from typing import List, Optional
+import json
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional
 from datetime import datetime
+from models.database import SessionLocal, Integration
 from schemas.models import Ticket
+from services.http_client import http_clients
+from services.circuit_breaker import CircuitOpenError
 from config.settings import settings
 
+ATLASSIAN_API_URL = "https://api.atlassian.com"
+
+# Fields needed to build a Ticket
+TICKET_FIELDS = 'id,key,summary,status,priority,assignee,created,updated'
+# Extra fields needed to split the combined "my work" search into categories
+MY_WORK_FIELDS = TICKET_FIELDS + ',reporter,watches'
+# Most issues scanned while filling the "my work" categories
+MY_WORK_SCAN_LIMIT = 500
+# Largest page Jira returns for a search
+SEARCH_PAGE_SIZE = 100
+# Search pages requested ahead of the one being consumed
+SEARCH_PREFETCH_PAGES = 2
+
+def parse_ticket(issue: dict) -> Ticket:
+    """Convert a Jira search result issue into a Ticket."""
+    fields = issue.get('fields', {})
+    return Ticket(
+        id=str(issue.get('id', '')),
+        key=issue.get('key', ''),
+        title=fields.get('summary', ''),
+        status=(fields.get('status') or {}).get('name', 'Unknown'),
+        priority=(fields.get('priority') or {}).get('name', 'None'),
+        assignee=fields.get('assignee', {}).get('displayName') if fields.get('assignee') else None,
+        created_at=datetime.fromisoformat(fields.get('created', '2023-01-01T00:00:00.000+0000').replace('Z', '+00:00')),
+        updated_at=datetime.fromisoformat(fields.get('updated', '2023-01-01T00:00:00.000+0000').replace('Z', '+00:00'))
+    )
+
+def load_integration_config(integration: Integration) -> dict:
+    """Parse the JSON provider metadata stored on an integration."""
+    try:
+        return json.loads(integration.config) if integration.config else {}
+    except ValueError:
+        return {}
+
+def update_integration_config(integration_id: int, values: dict):
+    """Merge values into the integration's JSON config in a fresh session."""
+    db = SessionLocal()
+    try:
+        integration = db.query(Integration).filter(Integration.id == integration_id).first()
+        if integration:
+            config = load_integration_config(integration)
+            config.update(values)
+            integration.config = json.dumps(config)
+            db.commit()
+    finally:
+        db.close()
+
 class JiraService:
-    def __init__(self, access_token: str, server: str = None):
+    def __init__(self, access_token: str, server: str = None, cloud_id: str = None,
+                 site_url: str = None, account_id: str = None, integration_id: int = None,
+                 http_client: httpx.AsyncClient = None):
         self.access_token = access_token
+        self.http_client = http_client or http_clients.get("api.atlassian.com")
         self.server = server or settings.jira_server
-        self.jira = None
+        # Combined "my work" search results per limit, shared by the widget getters
+        self._my_work: Dict[int, Dict[str, list]] = {}
+        self.cloud_id = cloud_id
+        self.site_url = site_url
+        self.account_id = account_id
+        self.integration_id = integration_id
         
         if access_token:
             self.headers = {
@@ -18,7 +78,85 @@ class JiraService:
                 'Accept': 'application/json'
             }
     
+    @classmethod
+    def from_integration(cls, integration: Integration) -> "JiraService":
+        """Create a service using the site and account cached on the integration."""
+        config = load_integration_config(integration)
+        return cls(
+            integration.access_token,
+            settings.jira_server,
+            cloud_id=config.get('cloud_id'),
+            site_url=config.get('site_url'),
+            account_id=config.get('account_id'),
+            integration_id=integration.id
+        )
+    
+    async def _resolve_site(self, client: httpx.AsyncClient) -> bool:
+        """Look up cloud_id, site URL and accountId and cache them on the integration."""
+        resources_response = await client.get(
+            f"{ATLASSIAN_API_URL}/oauth/token/accessible-resources",
+            headers=self.headers
+        )
+        if resources_response.status_code != 200:
+            print(f"Failed to get resources: {resources_response.status_code}")
+            return False
+        
+        resources = resources_response.json()
+        if not resources:
+            return False
+        
+        site = resources[0]
+        user_response = await client.get(
+            f"{ATLASSIAN_API_URL}/ex/jira/{site['id']}/rest/api/3/myself",
+            headers=self.headers
+        )
+        if user_response.status_code != 200:
+            print(f"Failed to get user info: {user_response.status_code}")
+            return False
+        
+        account_id = user_response.json().get('accountId')
+        if not account_id:
+            return False
+        
+        self.cloud_id = site['id']
+        self.site_url = site.get('url')
+        self.account_id = account_id
+        if self.integration_id is not None:
+            await asyncio.to_thread(update_integration_config, self.integration_id, {
+                'cloud_id': self.cloud_id,
+                'site_url': self.site_url,
+                'account_id': self.account_id
+            })
+        return True
+    
+    async def _ensure_site(self, client: httpx.AsyncClient) -> bool:
+        """Make sure cloud_id and accountId are known, resolving them only if not cached."""
+        if self.cloud_id and self.account_id:
+            return True
+        return await self._resolve_site(client)
+    
+    async def _api_get(self, client: httpx.AsyncClient, path: str, params: dict = None) -> httpx.Response:
+        """GET a Jira REST path on the cached site.
 
+        A 401/404 means the cached site may be stale (moved site, changed
+        access), so the site is resolved again and the request retried once.
+        """
+        response = await client.get(
+            f"{ATLASSIAN_API_URL}/ex/jira/{self.cloud_id}{path}",
+            headers=self.headers,
+            params=params
+        )
+        if response.status_code in (401, 404):
+            previous_cloud_id = self.cloud_id
+            # Only worth retrying if the lookup moved us to a different site
+            if not await self._resolve_site(client) or self.cloud_id == previous_cloud_id:
+                return response
+            response = await client.get(
+                f"{ATLASSIAN_API_URL}/ex/jira/{self.cloud_id}{path}",
+                headers=self.headers,
+                params=params
+            )
+        return response
     
     async def get_oauth_url(self, state: str = None) -> str:
         """Generate Jira OAuth 2.0 authorization URL."""
@@ -42,124 +180,119 @@ class JiraService:
     
     async def exchange_code_for_token(self, code: str) -> dict:
         """Exchange authorization code for access token using OAuth 2.0."""
-        import httpx
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                # OAuth 2.0 token exchange
-                response = await client.post(
-                    "https://auth.atlassian.com/oauth/token",
-                    headers={
-                        'Content-Type': 'application/json'
-                    },
-                    json={
-                        "grant_type": "authorization_code",
-                        "client_id": settings.jira_client_id,
-                        "client_secret": settings.jira_client_secret,
-                        "code": code,
-                        "redirect_uri": settings.jira_redirect_uri
-                    }
-                )
+        client = http_clients.get("auth.atlassian.com")
+        try:
+            # OAuth 2.0 token exchange
+            response = await client.post(
+                "https://auth.atlassian.com/oauth/token",
+                headers={
+                    'Content-Type': 'application/json'
+                },
+                json={
+                    "grant_type": "authorization_code",
+                    "client_id": settings.jira_client_id,
+                    "client_secret": settings.jira_client_secret,
+                    "code": code,
+                    "redirect_uri": settings.jira_redirect_uri
+                }
+            )
+            
+            if response.status_code == 200:
+                token_data = response.json()
                 
-                if response.status_code == 200:
-                    token_data = response.json()
-                    
-                    # Get user info with the access token
-                    user_info = await self._get_user_info_oauth2(token_data['access_token'])
-                    
-                    return {
-                        'access_token': token_data['access_token'],
-                        'refresh_token': token_data.get('refresh_token'),
-                        'expires_in': token_data.get('expires_in', 3600),
-                        'user_info': user_info
-                    }
-                else:
-                    print(f"Token exchange failed: {response.status_code} - {response.text}")
-                    return {}
-                    
-            except Exception as e:
-                print(f"Error exchanging code for token: {e}")
+                # Get user info with the access token
+                user_info = await self._get_user_info_oauth2(token_data['access_token'])
+                
+                return {
+                    'access_token': token_data['access_token'],
+                    'refresh_token': token_data.get('refresh_token'),
+                    'expires_in': token_data.get('expires_in', 3600),
+                    'user_info': user_info
+                }
+            else:
+                print(f"Token exchange failed: {response.status_code} - {response.text}")
                 return {}
+                
+        except Exception as e:
+            print(f"Error exchanging code for token: {e}")
+            return {}
     
     async def _get_user_info_oauth2(self, access_token: str) -> dict:
         """Get user info using OAuth 2.0 access token."""
-        import httpx
-        
-        async with httpx.AsyncClient() as client:
+        client = self.http_client
+        try:
+            # Get accessible resources (sites)
+            resources_response = await client.get(
+                "https://api.atlassian.com/oauth/token/accessible-resources",
+                headers={
+                    'Authorization': f'Bearer {access_token}',
+                    'Accept': 'application/json'
+                }
+            )
+            
+            if resources_response.status_code == 200:
+                resources = resources_response.json()
+                if resources:
+                    # Use the first available resource
+                    site = resources[0]
+                    cloud_id = site['id']
+                    
+                    # Get user profile
+                    profile_response = await client.get(
+                        f"https://api.atlassian.com/ex/jira/{cloud_id}/rest/api/3/myself",
+                        headers={
+                            'Authorization': f'Bearer {access_token}',
+                            'Accept': 'application/json'
+                        }
+                    )
+                    
+                    if profile_response.status_code == 200:
+                        profile = profile_response.json()
+                        return {
+                            'id': profile.get('accountId'),
+                            'email': profile.get('emailAddress'),
+                            'name': profile.get('displayName'),
+                            'cloud_id': cloud_id,
+                            'site_url': site.get('url')
+                        }
+            
+            return {'id': 'unknown', 'email': 'unknown', 'name': 'Unknown User'}
+            
+        except Exception as e:
+            print(f"Error getting user info: {e}")
+            return {'id': 'unknown', 'email': 'unknown', 'name': 'Unknown User'}
+    
+    async def get_user_info(self, access_token: str = None) -> dict:
+        """Get authenticated user information using OAuth 2.0."""
+        if access_token:
+            return await self._get_user_info_oauth2(access_token)
+        elif hasattr(self, 'headers') and self.headers:
             try:
+                client = self.http_client
                 # Get accessible resources (sites)
                 resources_response = await client.get(
                     "https://api.atlassian.com/oauth/token/accessible-resources",
-                    headers={
-                        'Authorization': f'Bearer {access_token}',
-                        'Accept': 'application/json'
-                    }
+                    headers=self.headers
                 )
                 
                 if resources_response.status_code == 200:
                     resources = resources_response.json()
                     if resources:
-                        # Use the first available resource
-                        site = resources[0]
-                        cloud_id = site['id']
-                        
+                        cloud_id = resources[0]['id']
                         # Get user profile
                         profile_response = await client.get(
                             f"https://api.atlassian.com/ex/jira/{cloud_id}/rest/api/3/myself",
-                            headers={
-                                'Authorization': f'Bearer {access_token}',
-                                'Accept': 'application/json'
-                            }
+                            headers=self.headers
                         )
                         
                         if profile_response.status_code == 200:
                             profile = profile_response.json()
                             return {
-                                'id': profile.get('accountId'),
-                                'email': profile.get('emailAddress'),
-                                'name': profile.get('displayName'),
-                                'cloud_id': cloud_id,
-                                'site_url': site.get('url')
+                                "id": profile.get("accountId"),
+                                "email": profile.get("emailAddress"),
+                                "name": profile.get("displayName"),
                             }
-                
                 return {'id': 'unknown', 'email': 'unknown', 'name': 'Unknown User'}
-                
-            except Exception as e:
-                print(f"Error getting user info: {e}")
-                return {'id': 'unknown', 'email': 'unknown', 'name': 'Unknown User'}
-    
-    async def get_user_info(self, access_token: str = None) -> dict:
-        """Get authenticated user information using OAuth 2.0."""
-        if access_token:
-            return await self._get_user_info_oauth2(access_token)
-        elif hasattr(self, 'headers') and self.headers:
-            try:
-                import httpx
-                async with httpx.AsyncClient() as client:
-                    # Get accessible resources (sites)
-                    resources_response = await client.get(
-                        "https://api.atlassian.com/oauth/token/accessible-resources",
-                        headers=self.headers
-                    )
-                    
-                    if resources_response.status_code == 200:
-                        resources = resources_response.json()
-                        if resources:
-                            cloud_id = resources[0]['id']
-                            # Get user profile
-                            profile_response = await client.get(
-                                f"https://api.atlassian.com/ex/jira/{cloud_id}/rest/api/3/myself",
-                                headers=self.headers
-                            )
-                            
-                            if profile_response.status_code == 200:
-                                profile = profile_response.json()
-                                return {
-                                    "id": profile.get("accountId"),
-                                    "email": profile.get("emailAddress"),
-                                    "name": profile.get("displayName"),
-                                }
-                    return {'id': 'unknown', 'email': 'unknown', 'name': 'Unknown User'}
             except Exception as e:
                 print(f"Error getting user info: {e}")
                 return {'id': 'unknown', 'email': 'unknown', 'name': 'Unknown User'}
@@ -172,167 +305,182 @@ class JiraService:
             return []
         
         try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                # Get accessible resources first
-                resources_response = await client.get(
-                    "https://api.atlassian.com/oauth/token/accessible-resources",
-                    headers=self.headers
-                )
-                
-                if resources_response.status_code != 200:
-                    print(f"Failed to get resources: {resources_response.status_code}")
-                    return []
-                    
-                resources = resources_response.json()
-                if not resources:
-                    return []
-                    
-                cloud_id = resources[0]['id']
-                
-                # Get current user info
-                user_response = await client.get(
-                    f"https://api.atlassian.com/ex/jira/{cloud_id}/rest/api/3/myself",
-                    headers=self.headers
-                )
-                
-                if user_response.status_code != 200:
-                    print(f"Failed to get user info: {user_response.status_code}")
-                    return []
-                    
-                user_info = user_response.json()
-                account_id = user_info.get('accountId')
-                
-                if not account_id:
-                    return []
-                
-                # Search for issues assigned to current user
-                jql = f'assignee = "{account_id}"'
-                search_response = await client.get(
-                    f"https://api.atlassian.com/ex/jira/{cloud_id}/rest/api/3/search",
-                    headers=self.headers,
-                    params={
-                        'jql': jql,
-                        'maxResults': limit,
-                        'fields': 'id,key,summary,status,priority,assignee,created,updated'
-                    }
-                )
-                
-                if search_response.status_code != 200:
-                    print(f"Failed to search issues: {search_response.status_code} - {search_response.text}")
-                    return []
-                
-                search_data = search_response.json()
-                issues = search_data.get('issues', [])
-
-                print(search_data)
-                
-                tickets = []
-                for issue in issues:
-                    fields = issue.get('fields', {})
-                    tickets.append(Ticket(
-                        id=str(issue.get('id', '')),
-                        key=issue.get('key', ''),
-                        title=fields.get('summary', ''),
-                        status=fields.get('status', {}).get('name', 'Unknown'),
-                        priority=fields.get('priority', {}).get('name', 'None'),
-                        assignee=fields.get('assignee', {}).get('displayName') if fields.get('assignee') else None,
-                        created_at=datetime.fromisoformat(fields.get('created', '2023-01-01T00:00:00.000+0000').replace('Z', '+00:00')),
-                        updated_at=datetime.fromisoformat(fields.get('updated', '2023-01-01T00:00:00.000+0000').replace('Z', '+00:00'))
-                    ))
-                
-                return tickets
-                
+            client = self.http_client
+            if not await self._ensure_site(client):
+                return []
+            
+            # Search for issues assigned to current user
+            search_response = await self._api_get(
+                client,
+                "/rest/api/3/search",
+                params={
+                    'jql': f'assignee = "{self.account_id}"',
+                    'maxResults': limit,
+                    'fields': TICKET_FIELDS
+                }
+            )
+            
+            if search_response.status_code != 200:
+                print(f"Failed to search issues: {search_response.status_code} - {search_response.text}")
+                return []
+            
+            search_data = search_response.json()
+            issues = search_data.get('issues', [])
+            
+            return [parse_ticket(issue) for issue in issues]
+            
+        except CircuitOpenError:
+            raise
         except Exception as e:
             print(f"Error fetching assigned tickets: {e}")
             return []
     
-    async def get_reported_tickets(self, limit: int = 10) -> List[Ticket]:
-        """Get tickets reported by the current user."""
-        if not self.jira:
-            return []
+    async def _search_page(self, client: httpx.AsyncClient, jql: str, fields: str, page_size: int,
+                           start_at: int = 0, page_token: str = None) -> dict:
+        """Fetch one page of JQL search results, raising on API errors."""
+        params = {
+            'jql': jql,
+            'maxResults': page_size,
+            'fields': fields
+        }
+        if page_token:
+            params['nextPageToken'] = page_token
+        else:
+            params['startAt'] = start_at
+        
+        response = await self._api_get(client, "/rest/api/3/search", params=params)
+        response.raise_for_status()
+        return response.json()
+    
+    async def iter_issues(self, jql: str, fields: str = TICKET_FIELDS, page_size: int = SEARCH_PAGE_SIZE,
+                          prefetch: int = SEARCH_PREFETCH_PAGES) -> AsyncIterator[dict]:
+        """Stream raw issues matching a JQL query, page by page.
+        
+        Up to ``prefetch`` further pages are requested while the current one is
+        being consumed. Offsets are scheduled ahead once ``total`` is known;
+        nextPageToken results can only be followed one page at a time. Pages
+        still in flight are cancelled when the consumer stops early.
+        """
+        client = self.http_client
+        if not await self._ensure_site(client):
+            raise ValueError("Could not resolve Jira site for this integration")
         
+        pending = deque([asyncio.create_task(self._search_page(client, jql, fields, page_size))])
+        next_start = page_size
         try:
-            # Get current user
-            current_user = self.jira.current_user()
-            
-            # Search for issues reported by current user
-            jql = f'reporter = "{current_user}" AND status != "Done" ORDER BY updated DESC'
-            issues = self.jira.search_issues(jql, maxResults=limit)
+            while pending:
+                search_data = await pending.popleft()
+                issues = search_data.get('issues', [])
+                
+                if search_data.get('nextPageToken'):
+                    pending.append(asyncio.create_task(self._search_page(
+                        client, jql, fields, page_size, page_token=search_data['nextPageToken']
+                    )))
+                elif issues and 'total' in search_data:
+                    while len(pending) < prefetch and next_start < search_data['total']:
+                        pending.append(asyncio.create_task(self._search_page(
+                            client, jql, fields, page_size, start_at=next_start
+                        )))
+                        next_start += page_size
+                
+                for issue in issues:
+                    yield issue
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def iter_tickets(self, jql: str, page_size: int = SEARCH_PAGE_SIZE,
+                           prefetch: int = SEARCH_PREFETCH_PAGES) -> AsyncIterator[Ticket]:
+        """Stream tickets matching a JQL query; see iter_issues."""
+        async for issue in self.iter_issues(jql, page_size=page_size, prefetch=prefetch):
+            yield parse_ticket(issue)
+    
+    async def search_tickets(self, jql: str, limit: Optional[int] = None) -> List[Ticket]:
+        """Run a JQL search across all pages; raises on API errors.
+        
+        ``limit=None`` returns every matching ticket, otherwise paging stops as
+        soon as ``limit`` tickets have been read.
+        """
+        tickets = []
+        page_size = SEARCH_PAGE_SIZE
+        prefetch = SEARCH_PREFETCH_PAGES
+        if limit is not None:
+            page_size = max(1, min(SEARCH_PAGE_SIZE, limit))
+            # Never prefetch pages beyond the ones that can reach the limit
+            prefetch = min(prefetch, -(-limit // page_size) - 1)
+        async for ticket in self.iter_tickets(jql, page_size=page_size, prefetch=prefetch):
+            tickets.append(ticket)
+            if limit is not None and len(tickets) >= limit:
+                break
+        return tickets
+    
+    async def get_my_work(self, limit: int = 10) -> Dict[str, list]:
+        """Get reported, watching and recent-activity items from one combined search.
+        
+        A single JQL query covers every issue the user is assigned to, reported
+        or watches; rows are split into categories here so the three widgets
+        cost one search. Paging stops once every category has ``limit`` items.
+        """
+        if limit in self._my_work:
+            return self._my_work[limit]
+        
+        jql = 'assignee = currentUser() OR reporter = currentUser() OR watcher = currentUser() ORDER BY updated DESC'
+        my_work = {"reported": [], "watching": [], "activity": []}
+        scanned = 0
+        
+        async for issue in self.iter_issues(jql, fields=MY_WORK_FIELDS, page_size=max(1, min(SEARCH_PAGE_SIZE, limit * 3))):
+            fields = issue.get('fields', {})
+            is_open = ((fields.get('status') or {}).get('statusCategory') or {}).get('key') != 'done'
+            ticket = parse_ticket(issue)
             
-            tickets = []
-            for issue in issues:
-                tickets.append(Ticket(
-                    id=str(issue.id),
-                    key=issue.key,
-                    title=issue.fields.summary,
-                    status=issue.fields.status.name,
-                    priority=issue.fields.priority.name if issue.fields.priority else "None",
-                    assignee=issue.fields.assignee.displayName if issue.fields.assignee else None,
-                    created_at=datetime.fromisoformat(issue.fields.created.replace('Z', '+00:00')),
-                    updated_at=datetime.fromisoformat(issue.fields.updated.replace('Z', '+00:00'))
-                ))
+            if is_open and len(my_work["reported"]) < limit and (fields.get('reporter') or {}).get('accountId') == self.account_id:
+                my_work["reported"].append(ticket)
+            if is_open and len(my_work["watching"]) < limit and (fields.get('watches') or {}).get('isWatching'):
+                my_work["watching"].append(ticket)
+            if len(my_work["activity"]) < limit:
+                my_work["activity"].append({
+                    "id": ticket.id,
+                    "key": ticket.key,
+                    "title": ticket.title,
+                    "type": "issue_updated",
+                    "updated_at": ticket.updated_at,
+                    "url": f"{self.site_url or self.server}/browse/{ticket.key}"
+                })
             
-            return tickets
+            scanned += 1
+            if all(len(items) >= limit for items in my_work.values()) or scanned >= MY_WORK_SCAN_LIMIT:
+                break
+        
+        self._my_work[limit] = my_work
+        return my_work
+    
+    async def get_reported_tickets(self, limit: int = 10) -> List[Ticket]:
+        """Get open tickets reported by the current user."""
+        try:
+            return (await self.get_my_work(limit))["reported"]
+        except CircuitOpenError:
+            raise
         except Exception as e:
             print(f"Error fetching reported tickets: {e}")
             return []
     
     async def get_watching_tickets(self, limit: int = 10) -> List[Ticket]:
-        """Get tickets the user is watching."""
-        if not self.jira:
-            return []
-        
+        """Get open tickets the user is watching."""
         try:
-            # Get current user
-            current_user = self.jira.current_user()
-            
-            # Search for issues being watched by current user
-            jql = f'watcher = "{current_user}" AND status != "Done" ORDER BY updated DESC'
-            issues = self.jira.search_issues(jql, maxResults=limit)
-            
-            tickets = []
-            for issue in issues:
-                tickets.append(Ticket(
-                    id=str(issue.id),
-                    key=issue.key,
-                    title=issue.fields.summary,
-                    status=issue.fields.status.name,
-                    priority=issue.fields.priority.name if issue.fields.priority else "None",
-                    assignee=issue.fields.assignee.displayName if issue.fields.assignee else None,
-                    created_at=datetime.fromisoformat(issue.fields.created.replace('Z', '+00:00')),
-                    updated_at=datetime.fromisoformat(issue.fields.updated.replace('Z', '+00:00'))
-                ))
-            
-            return tickets
+            return (await self.get_my_work(limit))["watching"]
+        except CircuitOpenError:
+            raise
         except Exception as e:
             print(f"Error fetching watching tickets: {e}")
             return []
     
     async def get_recent_activity(self, limit: int = 10) -> List[dict]:
-        """Get recent activity from Jira."""
-        if not self.jira:
-            return []
-        
+        """Get recently updated issues the user is involved in."""
         try:
-            # This is a simplified implementation
-            # You might want to use Jira's activity stream API for more detailed activity
-            current_user = self.jira.current_user()
-            jql = f'(assignee = "{current_user}" OR reporter = "{current_user}") ORDER BY updated DESC'
-            issues = self.jira.search_issues(jql, maxResults=limit)
-            
-            activities = []
-            for issue in issues:
-                activities.append({
-                    "id": issue.id,
-                    "key": issue.key,
-                    "title": issue.fields.summary,
-                    "type": "issue_updated",
-                    "updated_at": datetime.fromisoformat(issue.fields.updated.replace('Z', '+00:00')),
-                    "url": f"{self.server}/browse/{issue.key}"
-                })
-            
-            return activities
+            return (await self.get_my_work(limit))["activity"]
+        except CircuitOpenError:
+            raise
         except Exception as e:
             print(f"Error fetching recent activity: {e}")
             return []
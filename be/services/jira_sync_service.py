@@ -0,0 +1,196 @@
+"""
+Incremental sync of unresolved assigned Jira tickets into the local jira_tickets mirror.
+
+The mirror uses blocking sessions, so its database work runs in worker threads
+to keep the event loop free while syncing.
+"""
+import asyncio
+import math
+from datetime import datetime, timezone
+from typing import List, Optional, Set
+from sqlalchemy.orm import Session
+
+from models.database import SessionLocal, Integration
+from models.jira import JiraTicket
+from schemas.models import Ticket
+from services.jira_service import JiraService, load_integration_config, parse_ticket, update_integration_config
+from config.settings import settings
+
+# Extra minutes searched on every incremental sync to absorb clock skew
+SYNC_OVERLAP_MINUTES = 2
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp stored in the integration config."""
+    return datetime.fromisoformat(value) if value else None
+
+class JiraSyncService:
+    """Keeps the jira_tickets mirror of one Jira integration current."""
+    
+    def __init__(self, db: Session, integration: Integration):
+        self.db = db
+        self.integration = integration
+    
+    def has_synced(self) -> bool:
+        """Whether the mirror has been filled at least once."""
+        return "last_sync" in load_integration_config(self.integration)
+    
+    async def sync(self) -> int:
+        """Pull tickets updated since the last sync into the mirror.
+        
+        The first sync, and one every jira_full_resync_interval seconds, fetches
+        all unresolved assigned tickets and drops every other mirror row.
+        Incremental syncs also drop tickets reassigned away or resolved during
+        the window.
+        Returns the number of tickets fetched.
+        """
+        # Commits expire the row, so its first access after one would load it on the event loop
+        config = await asyncio.to_thread(load_integration_config, self.integration)
+        integration_id = self.integration.id
+        started_at = datetime.now(timezone.utc)
+        last_sync = _parse_timestamp(config.get("last_sync"))
+        last_full_sync = _parse_timestamp(config.get("last_full_sync"))
+        full_sync = (
+            last_sync is None
+            or last_full_sync is None
+            or (started_at - last_full_sync).total_seconds() >= settings.jira_full_resync_interval
+        )
+        
+        jira_service = JiraService.from_integration(self.integration)
+        jql = 'assignee = currentUser() AND resolution = Unresolved'
+        previously_assigned = set()
+        if not full_sync:
+            # Relative dates avoid depending on the Jira user's timezone
+            minutes = math.ceil((started_at - last_sync).total_seconds() / 60) + SYNC_OVERLAP_MINUTES
+            window = f' AND updated >= -{minutes}m'
+            jql += window
+            # Reassigned or resolved issues no longer match the query; searched first so an
+            # issue assigned back in between still shows up as assigned below
+            previously_assigned = {
+                str(issue['id'])
+                async for issue in jira_service.iter_issues('assignee WAS currentUser()' + window, fields='id')
+            }
+        jql += ' ORDER BY updated DESC'
+        
+        tickets = await jira_service.search_tickets(jql)
+        removed = previously_assigned - {ticket.id for ticket in tickets}
+        await asyncio.to_thread(self._store, tickets, full_sync, removed)
+        
+        values = {"last_sync": started_at.isoformat()}
+        if full_sync:
+            values["last_full_sync"] = started_at.isoformat()
+        await asyncio.to_thread(update_integration_config, integration_id, values)
+        self.db.expire(self.integration)
+        return len(tickets)
+    
+    def _store(self, tickets: List[Ticket], replace: bool = False, removed: Set[str] = frozenset()):
+        """Upsert tickets into the mirror and delete removed ones, or with replace everything else."""
+        existing = {
+            row.issue_id: row
+            for row in self.db.query(JiraTicket).filter(JiraTicket.integration_id == self.integration.id)
+        }
+        
+        for ticket in tickets:
+            self._upsert(existing.get(ticket.id), ticket)
+        
+        fetched_ids = {ticket.id for ticket in tickets}
+        for issue_id, row in existing.items():
+            if issue_id not in fetched_ids and (replace or issue_id in removed):
+                self.db.delete(row)
+        
+        self.db.commit()
+    
+    def _upsert(self, row: Optional[JiraTicket], ticket: Ticket):
+        """Copy a ticket onto its mirror row, creating the row if needed."""
+        if row is None:
+            row = JiraTicket(integration_id=self.integration.id, issue_id=ticket.id)
+            self.db.add(row)
+        row.key = ticket.key
+        row.title = ticket.title
+        row.status = ticket.status
+        row.priority = ticket.priority
+        row.assignee = ticket.assignee
+        row.created_at = ticket.created_at
+        row.updated_at = ticket.updated_at
+    
+    def apply_issue_event(self, issue: dict, deleted: bool = False):
+        """Patch the mirror from a webhook issue payload.
+        
+        The issue is upserted while it is unresolved and assigned to this
+        integration's account, and removed once it is deleted, resolved or
+        assigned to someone else.
+        """
+        account_id = load_integration_config(self.integration).get("account_id")
+        fields = issue.get('fields') or {}
+        assignee_id = (fields.get('assignee') or {}).get('accountId')
+        row = self.db.query(JiraTicket).filter(
+            JiraTicket.integration_id == self.integration.id,
+            JiraTicket.issue_id == str(issue.get('id'))
+        ).first()
+        
+        if deleted or not account_id or assignee_id != account_id or fields.get('resolution'):
+            if row is not None:
+                self.db.delete(row)
+        else:
+            self._upsert(row, parse_ticket(issue))
+        self.db.commit()
+    
+    def get_tickets(self, limit: int = 10) -> List[Ticket]:
+        """Get mirrored tickets, most recently updated first."""
+        rows = self.db.query(JiraTicket).filter(
+            JiraTicket.integration_id == self.integration.id
+        ).order_by(JiraTicket.updated_at.desc()).limit(limit).all()
+        
+        return [Ticket(
+            id=row.issue_id,
+            key=row.key,
+            title=row.title,
+            status=row.status,
+            priority=row.priority,
+            assignee=row.assignee,
+            created_at=row.created_at,
+            updated_at=row.updated_at
+        ) for row in rows]
+    
+    def count_tickets(self) -> int:
+        """Count mirrored tickets."""
+        return self.db.query(JiraTicket).filter(
+            JiraTicket.integration_id == self.integration.id
+        ).count()
+
+async def sync_integration(integration_id: int) -> int:
+    """Sync one integration's mirror in a session of its own. Returns tickets fetched."""
+    db = SessionLocal()
+    try:
+        integration = await asyncio.to_thread(db.get, Integration, integration_id)
+        return await JiraSyncService(db, integration).sync()
+    finally:
+        db.close()
+
+async def sync_all_integrations() -> int:
+    """Sync the mirror of every active Jira integration. Returns tickets fetched."""
+    db = SessionLocal()
+    try:
+        integrations = await asyncio.to_thread(db.query(Integration).filter(
+            Integration.service_name == "jira",
+            Integration.is_active == True
+        ).all)
+        
+        fetched = 0
+        for integration in integrations:
+            try:
+                fetched += await JiraSyncService(db, integration).sync()
+            except Exception as e:
+                await asyncio.to_thread(db.rollback)
+                print(f"Error syncing Jira tickets for integration {integration.id}: {e}")
+        return fetched
+    finally:
+        db.close()
+
+async def run_jira_sync_loop():
+    """Background loop that keeps every Jira ticket mirror current."""
+    while True:
+        try:
+            await sync_all_integrations()
+        except Exception as e:
+            print(f"Jira sync loop error: {e}")
+        await asyncio.sleep(settings.jira_sync_interval)
@@ -0,0 +1,69 @@
+"""
+In-process LRU cache with per-entry TTLs and a memory budget.
+"""
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, List, Optional, Tuple
+
+class LocalCache:
+    """Least-recently-used cache bounded by the approximate size of its entries.
+    
+    Values are stored as decoded Python objects and handed out as-is, so
+    callers must treat them as read-only.
+    """
+    
+    def __init__(self, max_bytes: int, max_ttl: float):
+        self.max_bytes = max_bytes
+        self.max_ttl = max_ttl
+        self.size = 0
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a live entry and mark it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any, size: int, ttl: Optional[float] = None):
+        """Store an entry for at most ttl (capped by max_ttl) seconds, evicting LRU entries to fit."""
+        self.delete(key)
+        ttl = self.max_ttl if ttl is None else min(ttl, self.max_ttl)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+    
+    def items(self) -> List[Tuple[str, Any]]:
+        """Live (key, value) pairs, without touching their recency."""
+        now = time.monotonic()
+        return [(key, value) for key, (value, expires_at, _) in self._entries.items() if expires_at > now]
+    
+    def delete(self, key: str):
+        """Drop one entry."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+    
+    def delete_pattern(self, pattern: str):
+        """Drop every entry whose key matches a glob pattern."""
+        for key in [key for key in self._entries if fnmatchcase(key, pattern)]:
+            self.delete(key)
+    
+    def clear(self):
+        """Drop every entry."""
+        self._entries.clear()
+        self.size = 0
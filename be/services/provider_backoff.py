@@ -0,0 +1,116 @@
+"""
+Negative caching of provider failures with exponential backoff per (user, service).
+
+While a provider keeps failing for a user we stop calling it until the backoff
+expires, and widgets are served their last good value instead of an error.
+The backoff state lives under the service's cache namespace, so reconnecting
+the integration (which bumps the service generation) clears it.
+"""
+import random
+import time
+import httpx
+from typing import Optional
+from google.auth.exceptions import RefreshError
+
+from services.cache_service import cache_service
+from config.settings import settings
+
+ENDPOINT = "backoff"
+
+def _error_headers(error: Exception) -> dict:
+    """Response headers of an httpx, googleapiclient or PyGithub error, if any."""
+    response = getattr(error, "response", None)
+    if response is not None and getattr(response, "headers", None) is not None:
+        return {key.lower(): value for key, value in response.headers.items()}
+    resp = getattr(error, "resp", None)  # googleapiclient HttpError; httplib2 responses are dicts
+    if isinstance(resp, dict):
+        return {key.lower(): value for key, value in resp.items()}
+    headers = getattr(error, "headers", None)  # PyGithub GithubException
+    if isinstance(headers, dict):
+        return {key.lower(): value for key, value in headers.items()}
+    return {}
+
+def _status_code(error: Exception) -> Optional[int]:
+    """HTTP status of an httpx, googleapiclient or PyGithub error, if any."""
+    response = getattr(error, "response", None)
+    if isinstance(getattr(response, "status_code", None), int):
+        return response.status_code
+    resp = getattr(error, "resp", None)
+    if getattr(resp, "status", None) is not None:
+        return int(resp.status)
+    status = getattr(error, "status", None)
+    return status if isinstance(status, int) else None
+
+def classify_error(error: Exception) -> str:
+    """Classify a provider failure as auth, rate_limit, server_error, unavailable or error."""
+    if isinstance(error, RefreshError):
+        return "auth"
+    status = _status_code(error)
+    if status == 429 or (status == 403 and _error_headers(error).get("x-ratelimit-remaining") == "0"):
+        return "rate_limit"
+    if status in (401, 403):
+        return "auth"
+    if status is not None and status >= 500:
+        return "server_error"
+    if isinstance(error, (httpx.TransportError, TimeoutError, ConnectionError)):
+        return "unavailable"
+    return "error"
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds the provider asked us to wait, from Retry-After or a rate-limit reset header."""
+    headers = _error_headers(error)
+    try:
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+        if headers.get("x-ratelimit-reset"):
+            return max(0.0, float(headers["x-ratelimit-reset"]) - time.time())
+    except ValueError:
+        pass
+    return None
+
+def backoff_seconds(failures: int, error_type: str, retry_after: Optional[float] = None) -> float:
+    """Delay before the next attempt after the given number of consecutive failures."""
+    if error_type == "auth":
+        # Credentials will not fix themselves; reconnecting clears the backoff
+        return settings.provider_backoff_max
+    if retry_after is not None:
+        return min(retry_after, settings.provider_backoff_max)
+    delay = min(settings.provider_backoff_max, settings.provider_backoff_base * 2 ** (failures - 1))
+    # Equal jitter so users who failed together do not retry together
+    return random.uniform(delay / 2, delay)
+
+class ProviderBackoff:
+    """Per-(user, service) failure state kept in the cache."""
+    
+    async def get_state(self, user_id: int, service: str) -> Optional[dict]:
+        """Get the failure state, including backoffs that already ran out."""
+        return await cache_service.get(user_id, service, ENDPOINT)
+    
+    @staticmethod
+    def is_active(state: Optional[dict]) -> bool:
+        """Whether calls to the provider are currently suspended."""
+        return bool(state) and state["retry_at"] > time.time()
+    
+    async def record_failure(self, user_id: int, service: str, error: Exception, state: Optional[dict] = None) -> dict:
+        """Record a failure and back off, escalating from the previous state."""
+        error_type = classify_error(error)
+        failures = (state or {}).get("failures", 0) + 1
+        delay = backoff_seconds(failures, error_type, _retry_after(error) if error_type == "rate_limit" else None)
+        new_state = {
+            "failures": failures,
+            "error_type": error_type,
+            "message": str(error),
+            "retry_at": time.time() + delay
+        }
+        # Remember the failure count past the backoff so the next failure escalates
+        ttl = int(delay + settings.provider_backoff_max)
+        await cache_service.set(user_id, service, ENDPOINT, new_state, ttl=ttl, compute_time=0)
+        print(f"Backing off {service} for user {user_id} for {int(delay)}s after {failures} {error_type} failure(s): {error}")
+        return new_state
+    
+    async def reset(self, user_id: int, service: str):
+        """Forget failures after a successful call."""
+        await cache_service.delete_pattern(user_id, service, ENDPOINT)
+
+# Global provider backoff instance
+provider_backoff = ProviderBackoff()